@@ -1,23 +1,28 @@
-import os
 import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import bisect
+import math
+from functools import lru_cache
+from itertools import islice
 from loguru import logger
-from typing import Dict, List, Any, Optional, Union, Tuple
-import json
-import uuid
-from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Tuple
+import orjson
+import msgpack
+import secrets
 import re
-from io import BytesIO
-import emoji
+import time
+from cachetools import TTLCache
+from redis.exceptions import RedisError
 from app.core.config import settings
 from app.services.llm_service import LLMService
-from app.services.vector_store import query_vector_store
 from app.services.item_service import ItemService
 from app.services.build_service import BuildService
 from app.services.server_service import ServerService
 from app.services.location_service import LocationService
+from app.services.cache_service import get_cache, get_binary_cache
+from app.services.exceptions import ServiceError
 
 # Initialize services
 llm_service = LLMService()
@@ -26,159 +31,194 @@ build_service = BuildService()
 server_service = ServerService()
 location_service = LocationService()
 
+# Expected failures that command handlers report back to the user; anything
+# else propagates to the command tree error handler
+COMMAND_ERRORS = (ServiceError, RedisError, asyncio.TimeoutError, discord.HTTPException)
+
+# Sentinel for cache lookups where None is a valid cached value
+_MISSING = object()
+
+# Slash command definitions:
+# (name, description, callback method, [(option name, option description, autocomplete method)])
+# All options are required strings.
+COMMAND_SPECS: Tuple[Tuple[str, str, str, Tuple[Tuple[str, str, Optional[str]], ...]], ...] = (
+    # General commands
+    ("ask", "Ask a question about Ashes of Creation", "ask_command", (
+        ("question", "Your question about Ashes of Creation", None),
+    )),
+    # Server commands
+    ("server", "Set your preferred game server for contextual queries", "server_command", (
+        ("name", "Server name", "server_autocomplete"),
+    )),
+    # Item commands
+    ("item", "Search and display item information", "item_command", (
+        ("name", "Item name to search for", "item_autocomplete"),
+    )),
+    # Build commands
+    ("build", "Search and display character builds", "build_command", (
+        ("query", "Search query (e.g., 'tank mage build')", None),
+    )),
+    # Map commands
+    ("location", "Get information about a location in Ashes of Creation", "location_command", (
+        ("name", "Location name to search for", "location_autocomplete"),
+    )),
+    # Resource commands
+    ("resource", "Find where to gather a specific resource", "resource_command", (
+        ("name", "Resource name to search for", "resource_autocomplete"),
+    )),
+    # Crafting commands
+    ("recipe", "Look up a crafting recipe", "recipe_command", (
+        ("name", "Recipe name to search for", "recipe_autocomplete"),
+    )),
+    # Utility commands
+    ("reset", "Reset your chat history with the assistant", "reset_command", ()),
+    ("help", "Get help with using the Ashes Assistant bot", "help_command", ()),
+)
+
+# Website URL templates, filled in with an entity id
+_ITEM_URL = settings.WEBSITE_URL + "/items/{id}"
+_MAP_LOCATION_URL = settings.WEBSITE_URL + "/map?location={id}"
+_MAP_RESOURCE_URL = settings.WEBSITE_URL + "/map?resource={id}"
+_CRAFTING_URL = settings.WEBSITE_URL + "/crafting/calculator?recipe={id}"
+
+# Fenced code blocks in AI responses
+_CODE_BLOCK_RE = re.compile(r'```(?:\w+)?\n[\s\S]+?\n```')
+
+# Sentence boundaries (the space after ., ! or ?) used when a paragraph is too long for one message
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?]) ')
+
+# Characters stripped from a question when using it as a response title
+_TITLE_CLEAN_RE = re.compile(r'[^\w\s\?\!]')
+
+# Seconds between edits of a streamed message (Discord allows 5 edits per 5s per message)
+_STREAM_EDIT_INTERVAL = 1.5
+
+# Reply when a direct message couldn't be answered
+_DM_ERROR_TEXT = "Sorry, I encountered an error processing your message. Please try again."
+
+# Embed colors by item rarity
+_RARITY_COLORS: Dict[str, discord.Color] = {
+    "common": discord.Color.light_gray(),
+    "uncommon": discord.Color.green(),
+    "rare": discord.Color.blue(),
+    "epic": discord.Color.purple(),
+    "legendary": discord.Color.gold(),
+    "artifact": discord.Color.red(),
+}
+_DEFAULT_COLOR = discord.Color.default()
+
+@lru_cache(maxsize=256)
+def _format_stat_name(stat_name: str) -> str:
+    """Format a stat key (e.g. 'attack_power') for display."""
+    return stat_name.replace('_', ' ').title()
+
+@lru_cache(maxsize=512)
+def _generate_response_title(question: str) -> str:
+    """Generate a title for the response based on the question."""
+    # Clean up the question
+    clean_question = _TITLE_CLEAN_RE.sub('', question).strip()
+    
+    # Truncate if too long
+    if len(clean_question) > 80:
+        clean_question = clean_question[:77] + "..."
+        
+    return clean_question
+
+def _describe_source(doc: Dict[str, Any]) -> Tuple[str, str]:
+    """Get the display name and 'type | server' details of a context document."""
+    source = doc.get('source', '')
+    source_name = source.rpartition('/')[2] or doc.get('source', 'Unknown')
+    server = doc.get('server', '')
+    server_text = f" | Server: {server}" if server else ""
+    return source_name, f"{doc.get('type', 'Unknown')}{server_text}"
+
+# Redis key holding a user's chat history (list of msgpack encoded messages)
+CHAT_HISTORY_KEY = "discord:chat:{user_id}"
+
+# Redis key marking a running command cooldown, expires when the cooldown ends
+COOLDOWN_KEY = "discord:cooldown:{user_id}:{command}"
+
+# Redis key holding the state of a paginated view (msgpack encoded)
+PAGINATION_KEY = "discord:pagination:{pagination_id}"
+
+# Redis key holding a rendered item embed and the item fields its view needs
+ITEM_EMBED_KEY = "discord:embed:item:{key}"
+
 class AshesAssistantBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix=settings.DISCORD_COMMAND_PREFIX, intents=intents)
         
-        # Chat session storage (user_id -> messages)
-        self.chat_sessions: Dict[str, List[Dict[str, str]]] = {}
-        
-        # Pagination storage (message_id -> pagination_state)
-        self.paginations: Dict[str, Dict[str, Any]] = {}
-        
-        # Command cooldowns (user_id -> {command: timestamp})
-        self.cooldowns: Dict[str, Dict[str, float]] = {}
-        
-    async def setup_hook(self) -> None:
-        # Register slash commands
-        await self.register_commands()
-        logger.info("Discord bot commands registered")
-        
-    async def register_commands(self):
-        """Register slash commands with Discord."""
-        # General commands
-        ask_command = app_commands.Command(
-            name="ask",
-            description="Ask a question about Ashes of Creation",
-            callback=self.ask_command
-        )
-        ask_command.add_option(
-            app_commands.Option(
-                name="question",
-                description="Your question about Ashes of Creation",
-                type=discord.AppCommandOptionType.string,
-                required=True
-            )
+        # Navigation views of recent paginations (pagination_id -> view), reused across clicks
+        self._pagination_views: TTLCache = TTLCache(
+            maxsize=settings.DISCORD_PAGINATION_VIEW_CACHE_SIZE,
+            ttl=settings.DISCORD_PAGINATION_TTL
         )
-        self.tree.add_command(ask_command)
         
-        # Server commands
-        server_command = app_commands.Command(
-            name="server",
-            description="Set your preferred game server for contextual queries",
-            callback=self.server_command
-        )
-        server_command.add_option(
-            app_commands.Option(
-                name="name",
-                description="Server name",
-                type=discord.AppCommandOptionType.string,
-                required=True,
-                autocomplete=self.server_autocomplete
-            )
-        )
-        self.tree.add_command(server_command)
+        # Embed creators for paginated views, referenced by name from the pagination state in Redis
+        self._pagination_creators: Dict[str, Callable[[Dict[str, Any], int, int], Awaitable[discord.Embed]]] = {
+            "build": self._build_embed_creator,
+        }
         
-        # Item commands
-        item_command = app_commands.Command(
-            name="item",
-            description="Search and display item information",
-            callback=self.item_command
-        )
-        item_command.add_option(
-            app_commands.Option(
-                name="name",
-                description="Item name to search for",
-                type=discord.AppCommandOptionType.string,
-                required=True,
-                autocomplete=self.item_autocomplete
-            )
+        # Autocomplete results ((kind, query) -> results), so each keystroke doesn't hit the services
+        self._autocomplete_cache: TTLCache = TTLCache(
+            maxsize=settings.DISCORD_AUTOCOMPLETE_CACHE_SIZE,
+            ttl=settings.DISCORD_AUTOCOMPLETE_TTL
         )
-        self.tree.add_command(item_command)
         
-        # Build commands
-        build_command = app_commands.Command(
-            name="build",
-            description="Search and display character builds",
-            callback=self.build_command
-        )
-        build_command.add_option(
-            app_commands.Option(
-                name="query",
-                description="Search query (e.g., 'tank mage build')",
-                type=discord.AppCommandOptionType.string,
-                required=True
-            )
+        # Game data lookups ((kind, key) -> result) for popular items, recipes, builds and locations
+        self._lookup_cache: TTLCache = TTLCache(
+            maxsize=settings.DISCORD_LOOKUP_CACHE_SIZE,
+            ttl=settings.DISCORD_LOOKUP_TTL
         )
-        self.tree.add_command(build_command)
         
-        # Map commands
-        location_command = app_commands.Command(
-            name="location",
-            description="Get information about a location in Ashes of Creation",
-            callback=self.location_command
-        )
-        location_command.add_option(
-            app_commands.Option(
-                name="name",
-                description="Location name to search for",
-                type=discord.AppCommandOptionType.string,
-                required=True,
-                autocomplete=self.location_autocomplete
-            )
-        )
-        self.tree.add_command(location_command)
+        # Server list index (sorted lowercase names, servers), which changes rarely
+        self._server_list_cache: TTLCache = TTLCache(maxsize=1, ttl=settings.DISCORD_SERVER_LIST_TTL)
         
-        # Resource commands
-        resource_command = app_commands.Command(
-            name="resource",
-            description="Find where to gather a specific resource",
-            callback=self.resource_command
+        # Server context (user_id -> server name), saves Redis lookups on every /ask
+        self._server_context_cache: TTLCache = TTLCache(
+            maxsize=settings.DISCORD_SERVER_CONTEXT_CACHE_SIZE,
+            ttl=settings.DISCORD_SERVER_CONTEXT_TTL
         )
-        resource_command.add_option(
-            app_commands.Option(
-                name="name",
-                description="Resource name to search for",
-                type=discord.AppCommandOptionType.string,
-                required=True,
-                autocomplete=self.resource_autocomplete
-            )
-        )
-        self.tree.add_command(resource_command)
         
-        # Crafting commands
-        crafting_command = app_commands.Command(
-            name="recipe",
-            description="Look up a crafting recipe",
-            callback=self.recipe_command
-        )
-        crafting_command.add_option(
-            app_commands.Option(
-                name="name",
-                description="Recipe name to search for",
-                type=discord.AppCommandOptionType.string,
-                required=True,
-                autocomplete=self.recipe_autocomplete
-            )
-        )
-        self.tree.add_command(crafting_command)
+        # Redis clients shared by all handlers (text and binary values), resolved on first use
+        self._cache = None
+        self._binary_cache = None
         
-        # Utility commands
-        reset_command = app_commands.Command(
-            name="reset",
-            description="Reset your chat history with the assistant",
-            callback=self.reset_command
+        # Static embeds are built once and reused for every invocation
+        self._help_embed: discord.Embed = self._create_help_embed()
+        self._reset_embed: discord.Embed = discord.Embed(
+            title="Chat History Reset",
+            description="Your chat history has been reset. We're starting with a clean slate!",
+            color=discord.Color.green()
         )
-        self.tree.add_command(reset_command)
         
-        help_command = app_commands.Command(
-            name="help",
-            description="Get help with using the Ashes Assistant bot",
-            callback=self.help_command
-        )
-        self.tree.add_command(help_command)
+    async def setup_hook(self) -> None:
+        # Register slash commands
+        self.tree.error(self.on_app_command_error)
+        await self.register_commands()
+        logger.info("Discord bot commands registered")
+        
+    async def register_commands(self):
+        """Register slash commands with Discord."""
+        for name, description, callback_name, options in COMMAND_SPECS:
+            command = app_commands.Command(
+                name=name,
+                description=description,
+                callback=getattr(self, callback_name)
+            )
+            for option_name, option_description, autocomplete_name in options:
+                command.add_option(
+                    app_commands.Option(
+                        name=option_name,
+                        description=option_description,
+                        type=discord.AppCommandOptionType.string,
+                        required=True,
+                        autocomplete=getattr(self, autocomplete_name) if autocomplete_name else None
+                    )
+                )
+            self.tree.add_command(command)
         
         # Sync commands with Discord
         await self.tree.sync()
@@ -191,17 +231,32 @@ class AshesAssistantBot(commands.Bot):
             name="your Ashes of Creation questions | /help"
         ))
     
+    async def on_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        """Fallback for errors not handled by the command itself."""
+        command_name = interaction.command.name if interaction.command else "unknown"
+        logger.exception(f"Unhandled error in /{command_name} command: {error}")
+        
+        message = "Sorry, something went wrong while processing your command. Please try again."
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
+    
     #==========================
     # Autocomplete handlers
     #==========================
     
     async def server_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         """Autocomplete for server names."""
-        servers = await server_service.get_all_servers()
-        filtered_servers = [s for s in servers if current.lower() in s['name'].lower()]
+        names, servers = await self._get_server_index()
+        
+        # Binary search the sorted lowercase names for the block starting with the prefix
+        prefix = current.lower()
+        start = bisect.bisect_left(names, prefix)
+        end = bisect.bisect_left(names, prefix + "\uffff", lo=start)
         return [
             app_commands.Choice(name=server['name'], value=server['id'])
-            for server in filtered_servers[:25]  # Discord limits to 25 choices
+            for server in servers[start:min(end, start + 25)]  # Discord limits to 25 choices
         ]
     
     async def item_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
@@ -209,7 +264,7 @@ class AshesAssistantBot(commands.Bot):
         if len(current) < 2:
             return []
             
-        items = await item_service.search_items(current, limit=25)
+        items = await self._cached_search("item", current, item_service.search_items)
         return [
             app_commands.Choice(name=item['name'], value=item['id'])
             for item in items
@@ -220,7 +275,7 @@ class AshesAssistantBot(commands.Bot):
         if len(current) < 2:
             return []
             
-        locations = await location_service.search_locations(current, limit=25)
+        locations = await self._cached_search("location", current, location_service.search_locations)
         return [
             app_commands.Choice(name=location['name'], value=location['id'])
             for location in locations
@@ -231,7 +286,7 @@ class AshesAssistantBot(commands.Bot):
         if len(current) < 2:
             return []
             
-        resources = await item_service.search_resources(current, limit=25)
+        resources = await self._cached_search("resource", current, item_service.search_resources)
         return [
             app_commands.Choice(name=resource['name'], value=resource['id'])
             for resource in resources
@@ -242,12 +297,30 @@ class AshesAssistantBot(commands.Bot):
         if len(current) < 2:
             return []
             
-        recipes = await item_service.search_recipes(current, limit=25)
+        recipes = await self._cached_search("recipe", current, item_service.search_recipes)
         return [
             app_commands.Choice(name=recipe['name'], value=recipe['id'])
             for recipe in recipes
         ]
     
+    async def _cached_search(self, kind: str, current: str, search: Any) -> List[Dict[str, Any]]:
+        """Run an autocomplete search, reusing recent results for the same query."""
+        key = (kind, current.lower())
+        results = self._autocomplete_cache.get(key)
+        if results is None:
+            results = await search(current, limit=25)
+            self._autocomplete_cache[key] = results
+        return results
+    
+    async def _get_server_index(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Get all servers sorted by lowercase name for prefix lookups, cached for a few minutes."""
+        index = self._server_list_cache.get("all")
+        if index is None:
+            servers = sorted(await server_service.get_all_servers(), key=lambda s: s['name'].lower())
+            index = ([server['name'].lower() for server in servers], servers)
+            self._server_list_cache["all"] = index
+        return index
+    
     #==========================
     # Command handlers
     #==========================
@@ -260,42 +333,34 @@ class AshesAssistantBot(commands.Bot):
         # Defer the response since it might take some time
         await interaction.response.defer(thinking=True)
         
-        # Get or create chat session for this user
-        user_id = str(interaction.user.id)
-        if user_id not in self.chat_sessions:
-            self.chat_sessions[user_id] = []
-            
-        # Add user message to chat history
-        self.chat_sessions[user_id].append({
-            "role": "user",
-            "content": question
-        })
+        user_id = interaction.user.id
+        user_message = {"role": "user", "content": question}
         
         try:
-            # Get server context if any
-            server_context = await self.get_user_server(user_id)
+            # Load chat history and server context (if any) for this user
+            history, server_context = await asyncio.gather(
+                self._get_chat_history(user_id),
+                self.get_user_server(user_id)
+            )
             
             # Get response from AI
             response_text, context_docs = await llm_service.get_chat_completion(
-                messages=self.chat_sessions[user_id],
+                messages=history + [user_message],
                 query=question,
                 server=server_context
             )
             
-            # Add assistant response to chat history
-            self.chat_sessions[user_id].append({
-                "role": "assistant",
-                "content": response_text
-            })
-            
-            # Truncate history if it gets too long (keep most recent 20 messages)
-            if len(self.chat_sessions[user_id]) > 20:
-                self.chat_sessions[user_id] = self.chat_sessions[user_id][-20:]
+            # Store the exchange in the user's chat history
+            await self._append_chat_history(
+                user_id,
+                user_message,
+                {"role": "assistant", "content": response_text}
+            )
             
             # Format response into chunks if needed (Discord has 2000 char limit)
             await self.send_formatted_response(interaction, question, response_text, context_docs)
             
-        except Exception as e:
+        except COMMAND_ERRORS as e:
             logger.error(f"Error processing ask command: {e}")
             await interaction.followup.send("Sorry, I encountered an error processing your request. Please try again.")
     
@@ -304,7 +369,7 @@ class AshesAssistantBot(commands.Bot):
         if not await self._check_cooldown(interaction, "server", 2):
             return
             
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
         
         try:
             # Get server details
@@ -318,9 +383,9 @@ class AshesAssistantBot(commands.Bot):
             
             # Store the server preference in Redis
             redis_key = f"discord:server:{user_id}"
-            from services.cache_service import get_cache
-            cache = await get_cache()
+            cache = await self._get_cache()
             await cache.set(redis_key, server['id'])
+            self._server_context_cache[user_id] = server['name']
             
             # Create embed response
             embed = discord.Embed(
@@ -334,7 +399,7 @@ class AshesAssistantBot(commands.Bot):
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
-        except Exception as e:
+        except COMMAND_ERRORS as e:
             logger.error(f"Error setting server context: {e}")
             await interaction.response.send_message(
                 "There was an error setting your server context. Please try again later.",
@@ -346,68 +411,43 @@ class AshesAssistantBot(commands.Bot):
         if not await self._check_cooldown(interaction, "item", 3):
             return
             
-        await interaction.response.defer(thinking=True)
-        
         try:
-            # Get item details
-            item = await item_service.get_item(name)
-            if not item:
-                await interaction.followup.send("Item not found. Please try a different search term.")
-                return
-            
-            # Create embed for item
-            embed = discord.Embed(
-                title=item['name'],
-                description=item.get('description', 'No description available.'),
-                color=self._get_rarity_color(item.get('rarity', 'common'))
+            # Defer the response while checking for a cached embed
+            embed_key = ITEM_EMBED_KEY.format(key=name)
+            _, cached = await asyncio.gather(
+                interaction.response.defer(thinking=True),
+                self._get_cached_embed(embed_key)
             )
             
-            # Add image if available
-            if 'image_url' in item and item['image_url']:
-                embed.set_thumbnail(url=item['image_url'])
-            
-            # Add basic info
-            embed.add_field(name="Type", value=item.get('type', 'Unknown'), inline=True)
-            embed.add_field(name="Rarity", value=item.get('rarity', 'Common').capitalize(), inline=True)
-            embed.add_field(name="Level", value=str(item.get('level', 'N/A')), inline=True)
-            
-            # Add stats if available
-            if 'stats' in item and item['stats']:
-                stats_text = ""
-                for stat_name, value in item['stats'].items():
-                    # Format stat name for readability
-                    formatted_name = stat_name.replace('_', ' ').title()
-                    stats_text += f"**{formatted_name}:** +{value}\n"
-                embed.add_field(name="Stats", value=stats_text, inline=False)
-            
-            # Add effects if available
-            if 'effects' in item and item['effects']:
-                effects_text = ""
-                for effect in item['effects']:
-                    effects_text += f"**{effect.get('name', 'Effect')}:** {effect.get('description', 'No description')}\n"
-                embed.add_field(name="Effects", value=effects_text, inline=False)
-            
-            # Add source information
-            embed.add_field(name="Source", value=item.get('source', 'Unknown'), inline=False)
-            
-            # Add footer with retrieval info
-            embed.set_footer(text=f"Item ID: {item['id']} • Use /recipe to see crafting details if applicable")
+            if cached:
+                item = cached["item"]
+                embed = discord.Embed.from_dict(cached["embed"])
+            else:
+                # Get item details
+                item = await self._cached_lookup("item", name, item_service.get_item)
+                if not item:
+                    await interaction.followup.send("Item not found. Please try a different search term.")
+                    return
+                
+                embed = self._create_item_embed(item)
+                await self._set_cached_embed(embed_key, {
+                    "item": {"id": item['id'], "name": item['name']},
+                    "embed": embed.to_dict()
+                })
             
             # Create view with buttons
             view = discord.ui.View()
             
             # Add link to website item page if available
-            website_url = f"{settings.WEBSITE_URL}/items/{item['id']}"
+            website_url = _ITEM_URL.format(id=item['id'])
             view.add_item(discord.ui.Button(label="View on Website", url=website_url))
             
             # Add button to show similar items
-            similar_button = discord.ui.Button(label="Similar Items", custom_id=f"similar:{item['id']}")
-            similar_button.callback = self._create_similar_items_callback(item)
-            view.add_item(similar_button)
+            view.add_item(discord.ui.Button(label="Similar Items", custom_id=f"similar:{item['id']}"))
             
             await interaction.followup.send(embed=embed, view=view)
             
-        except Exception as e:
+        except COMMAND_ERRORS as e:
             logger.error(f"Error in item command: {e}")
             await interaction.followup.send("Sorry, I encountered an error retrieving item information.")
     
@@ -416,11 +456,12 @@ class AshesAssistantBot(commands.Bot):
         if not await self._check_cooldown(interaction, "build", 3):
             return
             
-        await interaction.response.defer(thinking=True)
-        
         try:
-            # Search for builds
-            builds = await build_service.search_builds(query, limit=5)
+            # Defer the response while searching for builds
+            _, builds = await asyncio.gather(
+                interaction.response.defer(thinking=True),
+                self._cached_lookup("builds", query, build_service.search_builds, limit=5)
+            )
             
             if not builds:
                 await interaction.followup.send(
@@ -429,14 +470,14 @@ class AshesAssistantBot(commands.Bot):
                 return
             
             # Create initial response with navigation
-            embed = await self._create_build_embed(builds[0], 1, len(builds))
+            embed = await self._build_embed_creator(builds[0], 1, len(builds))
             
             # Create pagination view
-            view = self._create_pagination_view(builds, self._create_build_embed)
+            view = await self._create_pagination_view(builds, "build")
             
             await interaction.followup.send(embed=embed, view=view)
             
-        except Exception as e:
+        except COMMAND_ERRORS as e:
             logger.error(f"Error in build command: {e}")
             await interaction.followup.send("Sorry, I encountered an error retrieving builds.")
     
@@ -445,11 +486,12 @@ class AshesAssistantBot(commands.Bot):
         if not await self._check_cooldown(interaction, "location", 3):
             return
             
-        await interaction.response.defer(thinking=True)
-        
         try:
-            # Get location details
-            location = await location_service.get_location(name)
+            # Defer the response while fetching location details
+            _, location = await asyncio.gather(
+                interaction.response.defer(thinking=True),
+                self._cached_lookup("location", name, location_service.get_location)
+            )
             if not location:
                 await interaction.followup.send("Location not found. Please try a different search term.")
                 return
@@ -472,20 +514,22 @@ class AshesAssistantBot(commands.Bot):
             
             # Add points of interest if available
             if 'points_of_interest' in location and location['points_of_interest']:
-                poi_text = ""
-                for poi in location['points_of_interest'][:5]:  # Limit to 5 to avoid too long embed
-                    poi_text += f"• {poi['name']}: {poi.get('description', 'No description')}\n"
+                poi_text = "\n".join(
+                    f"• {poi['name']}: {poi.get('description', 'No description')}"
+                    for poi in location['points_of_interest'][:5]  # Limit to 5 to avoid too long embed
+                )
                 embed.add_field(name="Points of Interest", value=poi_text, inline=False)
             
             # Add resources if available
             if 'resources' in location and location['resources']:
-                resource_text = ""
-                for resource in location['resources'][:10]:  # Limit to 10
-                    resource_text += f"• {resource['name']}\n"
+                resource_text = "\n".join(
+                    f"• {resource['name']}"
+                    for resource in location['resources'][:10]  # Limit to 10
+                )
                 embed.add_field(name="Available Resources", value=resource_text, inline=False)
             
             # Add footer with map link
-            map_url = f"{settings.WEBSITE_URL}/map?location={location['id']}"
+            map_url = _MAP_LOCATION_URL.format(id=location['id'])
             embed.set_footer(text=f"Use /resource to find specific gathering locations • Location ID: {location['id']}")
             
             # Create view with buttons
@@ -496,7 +540,7 @@ class AshesAssistantBot(commands.Bot):
             
             await interaction.followup.send(embed=embed, view=view)
             
-        except Exception as e:
+        except COMMAND_ERRORS as e:
             logger.error(f"Error in location command: {e}")
             await interaction.followup.send("Sorry, I encountered an error retrieving location information.")
     
@@ -505,17 +549,20 @@ class AshesAssistantBot(commands.Bot):
         if not await self._check_cooldown(interaction, "resource", 3):
             return
             
-        await interaction.response.defer(thinking=True)
-        
         try:
-            # Get resource details
-            resource = await item_service.get_resource(name)
+            # Defer the response while fetching resource details
+            _, resource = await asyncio.gather(
+                interaction.response.defer(thinking=True),
+                self._cached_lookup("resource", name, item_service.get_resource)
+            )
             if not resource:
                 await interaction.followup.send("Resource not found. Please try a different search term.")
                 return
             
             # Get gathering locations for this resource
-            locations = await location_service.get_resource_locations(resource['id'])
+            locations = await self._cached_lookup(
+                "resource_locations", resource['id'], location_service.get_resource_locations
+            )
             
             # Create embed for resource
             embed = discord.Embed(
@@ -534,19 +581,20 @@ class AshesAssistantBot(commands.Bot):
             
             # Add locations
             if locations:
-                location_text = ""
-                for location in locations[:8]:  # Limit to avoid too long embed
-                    drop_rate = location.get('drop_rate', 0) * 100
-                    location_text += f"• **{location['name']}**: {drop_rate:.1f}% drop rate\n"
+                location_text = "\n".join(
+                    f"• **{location['name']}**: {location.get('drop_rate', 0) * 100:.1f}% drop rate"
+                    for location in locations[:8]  # Limit to avoid too long embed
+                )
                 embed.add_field(name="Best Gathering Locations", value=location_text, inline=False)
             else:
                 embed.add_field(name="Gathering Locations", value="No specific gathering locations found.", inline=False)
             
             # Add uses in crafting if available
             if 'used_in_recipes' in resource and resource['used_in_recipes']:
-                recipe_text = ""
-                for recipe in resource['used_in_recipes'][:5]:  # Limit to 5
-                    recipe_text += f"• {recipe['name']}\n"
+                recipe_text = "\n".join(
+                    f"• {recipe['name']}"
+                    for recipe in resource['used_in_recipes'][:5]  # Limit to 5
+                )
                 embed.add_field(name="Used in Crafting", value=recipe_text, inline=False)
             
             # Add tips for gathering
@@ -560,12 +608,12 @@ class AshesAssistantBot(commands.Bot):
             view = discord.ui.View()
             
             # Add link to website map
-            map_url = f"{settings.WEBSITE_URL}/map?resource={resource['id']}"
+            map_url = _MAP_RESOURCE_URL.format(id=resource['id'])
             view.add_item(discord.ui.Button(label="View on Resource Map", url=map_url))
             
             await interaction.followup.send(embed=embed, view=view)
             
-        except Exception as e:
+        except COMMAND_ERRORS as e:
             logger.error(f"Error in resource command: {e}")
             await interaction.followup.send("Sorry, I encountered an error retrieving resource information.")
     
@@ -574,11 +622,12 @@ class AshesAssistantBot(commands.Bot):
         if not await self._check_cooldown(interaction, "recipe", 3):
             return
             
-        await interaction.response.defer(thinking=True)
-        
         try:
-            # Get recipe details
-            recipe = await item_service.get_recipe(name)
+            # Defer the response while fetching recipe details
+            _, recipe = await asyncio.gather(
+                interaction.response.defer(thinking=True),
+                self._cached_lookup("recipe", name, item_service.get_recipe)
+            )
             if not recipe:
                 await interaction.followup.send("Recipe not found. Please try a different search term.")
                 return
@@ -601,26 +650,28 @@ class AshesAssistantBot(commands.Bot):
             
             # Add ingredients
             if 'ingredients' in recipe and recipe['ingredients']:
-                ingredients_text = ""
-                for ingredient in recipe['ingredients']:
-                    ingredients_text += f"• **{ingredient['name']}**: {ingredient['amount']} {ingredient.get('quality', '')}\n"
+                ingredients_text = "\n".join(
+                    f"• **{ingredient['name']}**: {ingredient['amount']} {ingredient.get('quality', '')}"
+                    for ingredient in recipe['ingredients']
+                )
                 embed.add_field(name="Ingredients", value=ingredients_text, inline=False)
             
             # Add result details
             if 'result_item' in recipe and recipe['result_item']:
                 result = recipe['result_item']
-                result_text = f"**Amount**: {recipe.get('result_amount', 1)}\n"
+                result_lines = [f"**Amount**: {recipe.get('result_amount', 1)}"]
                 
                 if 'rarity' in result:
-                    result_text += f"**Rarity**: {result['rarity'].capitalize()}\n"
+                    result_lines.append(f"**Rarity**: {result['rarity'].capitalize()}")
                     
                 if 'stats' in result and result['stats']:
-                    result_text += "**Stats**:\n"
-                    for stat_name, value in result['stats'].items():
-                        formatted_name = stat_name.replace('_', ' ').title()
-                        result_text += f"- {formatted_name}: +{value}\n"
+                    result_lines.append("**Stats**:")
+                    result_lines.extend(
+                        f"- {_format_stat_name(stat_name)}: +{value}"
+                        for stat_name, value in result['stats'].items()
+                    )
                 
-                embed.add_field(name="Result", value=result_text, inline=False)
+                embed.add_field(name="Result", value="\n".join(result_lines), inline=False)
             
             # Add recipe source
             if 'source' in recipe:
@@ -633,7 +684,7 @@ class AshesAssistantBot(commands.Bot):
             view = discord.ui.View()
             
             # Add link to website crafting calculator
-            crafting_url = f"{settings.WEBSITE_URL}/crafting/calculator?recipe={recipe['id']}"
+            crafting_url = _CRAFTING_URL.format(id=recipe['id'])
             view.add_item(discord.ui.Button(label="Open in Crafting Calculator", url=crafting_url))
             
             # If result item exists, add button to view it
@@ -647,26 +698,23 @@ class AshesAssistantBot(commands.Bot):
             
             await interaction.followup.send(embed=embed, view=view)
             
-        except Exception as e:
+        except COMMAND_ERRORS as e:
             logger.error(f"Error in recipe command: {e}")
             await interaction.followup.send("Sorry, I encountered an error retrieving recipe information.")
     
     async def reset_command(self, interaction: discord.Interaction):
         """Reset chat history for a user."""
-        user_id = str(interaction.user.id)
-        if user_id in self.chat_sessions:
-            self.chat_sessions[user_id] = []
-            
-        embed = discord.Embed(
-            title="Chat History Reset",
-            description="Your chat history has been reset. We're starting with a clean slate!",
-            color=discord.Color.green()
-        )
+        user_id = interaction.user.id
+        await self._clear_chat_history(user_id)
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=self._reset_embed, ephemeral=True)
     
     async def help_command(self, interaction: discord.Interaction):
         """Show help information about the bot."""
+        await interaction.response.send_message(embed=self._help_embed, ephemeral=True)
+    
+    def _create_help_embed(self) -> discord.Embed:
+        """Create the static help embed."""
         embed = discord.Embed(
             title="MyAshes.ai Discord Bot - Help",
             description="I'm your Ashes of Creation assistant! Here's how you can interact with me:",
@@ -725,7 +773,7 @@ class AshesAssistantBot(commands.Bot):
         # Add thumbnail
         embed.set_thumbnail(url=settings.BOT_LOGO_URL)
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return embed
     
     #==========================
     # Message processing
@@ -737,56 +785,54 @@ class AshesAssistantBot(commands.Bot):
         if message.author == self.user:
             return
             
-        # Process direct messages
-        if isinstance(message.channel, discord.DMChannel):
-            # Check for command prefix
-            if message.content.startswith('/'):
-                # Let the command system handle it
-                await self.process_commands(message)
-                return
-                
-            # Regular message, treat as a question
+        # Regular direct message, treat as a question
+        if isinstance(message.channel, discord.DMChannel) and not message.content.startswith('/'):
             async with message.channel.typing():
-                # Get or create chat session for this user
-                user_id = str(message.author.id)
-                if user_id not in self.chat_sessions:
-                    self.chat_sessions[user_id] = []
-                    
-                # Add user message to chat history
-                self.chat_sessions[user_id].append({
-                    "role": "user",
-                    "content": message.content
-                })
+                user_id = message.author.id
+                user_message = {"role": "user", "content": message.content}
                 
+                placeholder = None
+                streaming = False
                 try:
-                    # Get server context if any
-                    server_context = await self.get_user_server(user_id)
+                    placeholder = await message.channel.send("…")
+                    
+                    # Load chat history and server context (if any) for this user
+                    history, server_context = await asyncio.gather(
+                        self._get_chat_history(user_id),
+                        self.get_user_server(user_id)
+                    )
                     
-                    # Get response from AI
-                    response_text, context_docs = await llm_service.get_chat_completion(
-                        messages=self.chat_sessions[user_id],
+                    # Stream the response from AI into the DM as it is generated
+                    tokens, context_docs = await llm_service.stream_chat_completion(
+                        messages=history + [user_message],
                         query=message.content,
                         server=server_context
                     )
+                    streaming = True
+                    response_text = await self._stream_dm_response(placeholder, tokens)
                     
-                    # Add assistant response to chat history
-                    self.chat_sessions[user_id].append({
-                        "role": "assistant",
-                        "content": response_text
-                    })
-                    
-                    # Truncate history if it gets too long (keep most recent 20 messages)
-                    if len(self.chat_sessions[user_id]) > 20:
-                        self.chat_sessions[user_id] = self.chat_sessions[user_id][-20:]
-                    
-                    # Format and send response
-                    await self.send_formatted_dm_response(message, response_text, context_docs)
+                    # Store the exchange in the user's chat history and add sources
+                    pending = [self._append_chat_history(
+                        user_id,
+                        user_message,
+                        {"role": "assistant", "content": response_text}
+                    )]
+                    if sources_embed := self._build_sources_embed(context_docs):
+                        pending.append(message.channel.send(embed=sources_embed))
+                    await asyncio.gather(*pending)
                     
                 except Exception as e:
-                    logger.error(f"Error processing direct message: {e}")
-                    await message.channel.send("Sorry, I encountered an error processing your message. Please try again.")
+                    # DMs bypass the app command error handler, so always answer here
+                    if isinstance(e, COMMAND_ERRORS):
+                        logger.error(f"Error processing direct message: {e}")
+                    else:
+                        logger.exception("Unexpected error processing direct message")
+                    # A failed stream already replied in place of its partial answer
+                    if not streaming:
+                        await self._reply_dm_error(message.channel, placeholder)
+            return
         
-        # Process commands in the usual way
+        # Let the command system handle everything else
         await self.process_commands(message)
     
     async def on_interaction(self, interaction: discord.Interaction):
@@ -814,30 +860,110 @@ class AshesAssistantBot(commands.Bot):
     # Helper methods
     #==========================
     
-    async def get_user_server(self, user_id: str) -> Optional[str]:
+    async def _get_cache(self):
+        """Get the shared Redis client."""
+        if self._cache is None:
+            self._cache = await get_cache()
+        return self._cache
+    
+    async def _cached_lookup(self, kind: str, key: str, fetch: Any, **kwargs: Any) -> Any:
+        """Fetch game data through a service, reusing recent results for the same key."""
+        cache_key = (kind, key)
+        result = self._lookup_cache.get(cache_key)
+        if result is None:
+            result = await fetch(key, **kwargs)
+            # Don't cache misses so newly added data shows up immediately
+            if result:
+                self._lookup_cache[cache_key] = result
+        return result
+    
+    async def _get_binary_cache(self):
+        """Get the shared Redis client for binary values."""
+        if self._binary_cache is None:
+            self._binary_cache = await get_binary_cache()
+        return self._binary_cache
+    
+    async def get_user_server(self, user_id: int) -> Optional[str]:
         """Get the server context for a user."""
+        # Serve recent lookups (including "no server set") from process memory
+        server_name = self._server_context_cache.get(user_id, _MISSING)
+        if server_name is not _MISSING:
+            return server_name
+        
         try:
-            from services.cache_service import get_cache
-            cache = await get_cache()
+            cache = await self._get_cache()
             redis_key = f"discord:server:{user_id}"
             server_id = await cache.get(redis_key)
             
+            server_name = None
             if server_id:
                 server = await server_service.get_server(server_id)
-                return server['name'] if server else None
-                
-            return None
+                server_name = server['name'] if server else None
+            
+            self._server_context_cache[user_id] = server_name
+            return server_name
         except Exception as e:
             logger.error(f"Error getting user server context: {e}")
             return None
     
+    async def _get_chat_history(self, user_id: int) -> List[Dict[str, str]]:
+        """Load the stored chat history for a user, oldest message first."""
+        try:
+            cache = await self._get_binary_cache()
+            entries = await cache.lrange(CHAT_HISTORY_KEY.format(user_id=user_id), 0, -1)
+            return [msgpack.unpackb(entry, raw=False) for entry in entries]
+        except Exception as e:
+            logger.error(f"Error loading chat history: {e}")
+            return []
+    
+    async def _append_chat_history(self, user_id: int, *messages: Dict[str, str]) -> None:
+        """Append messages to a user's chat history, keeping only the most recent ones."""
+        try:
+            cache = await self._get_binary_cache()
+            redis_key = CHAT_HISTORY_KEY.format(user_id=user_id)
+            
+            # Push, truncate and refresh the expiry in a single round-trip
+            async with cache.pipeline(transaction=True) as pipe:
+                pipe.rpush(redis_key, *(msgpack.packb(m, use_bin_type=True) for m in messages))
+                pipe.ltrim(redis_key, -settings.DISCORD_CHAT_HISTORY_LENGTH, -1)
+                pipe.expire(redis_key, settings.DISCORD_CHAT_HISTORY_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error saving chat history: {e}")
+    
+    async def _clear_chat_history(self, user_id: int) -> None:
+        """Delete a user's chat history."""
+        try:
+            cache = await self._get_cache()
+            await cache.delete(CHAT_HISTORY_KEY.format(user_id=user_id))
+        except Exception as e:
+            logger.error(f"Error clearing chat history: {e}")
+    
+    async def _get_cached_embed(self, redis_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached embed payload, if any."""
+        try:
+            cache = await self._get_cache()
+            raw = await cache.get(redis_key)
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            logger.error(f"Error reading cached embed: {e}")
+            return None
+    
+    async def _set_cached_embed(self, redis_key: str, payload: Dict[str, Any]) -> None:
+        """Cache an embed payload for reuse by later invocations."""
+        try:
+            cache = await self._get_cache()
+            await cache.set(redis_key, orjson.dumps(payload), ex=settings.DISCORD_EMBED_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Error caching embed: {e}")
+    
     async def send_formatted_response(self, interaction: discord.Interaction, question: str, text: str, context_docs: List[Dict[str, Any]]):
         """Format and send an AI response with proper formatting and context."""
         # Check if we can create an embed response
         if self._should_use_embed_for_response(text):
             # Create a nicer formatted embed
             embed = discord.Embed(
-                title=self._generate_response_title(question),
+                title=_generate_response_title(question),
                 description=text[:4096],  # Discord embed description limit
                 color=discord.Color.blue()
             )
@@ -849,17 +975,11 @@ class AshesAssistantBot(commands.Bot):
             
             # Add source information if available
             if context_docs:
-                sources_text = ""
-                for i, doc in enumerate(context_docs[:3], 1):
-                    source_name = doc.get('source', '').split('/')[-1] or doc.get('source', 'Unknown')
-                    doc_type = doc.get('type', 'Unknown')
-                    server = doc.get('server', '')
-                    server_text = f" | Server: {server}" if server else ""
-                    
-                    sources_text += f"{i}. **{source_name}** ({doc_type}{server_text})\n"
-                
-                if sources_text:
-                    embed.add_field(name="Sources", value=sources_text, inline=False)
+                sources_text = "\n".join(
+                    f"{i}. **{source_name}** ({source_details})"
+                    for i, (source_name, source_details) in enumerate(map(_describe_source, context_docs[:3]), 1)
+                )
+                embed.add_field(name="Sources", value=sources_text, inline=False)
             
             embed.set_footer(text="Powered by MyAshes.ai • Data updated regularly")
             
@@ -880,64 +1000,110 @@ class AshesAssistantBot(commands.Bot):
             # Send first chunk as the main response
             await interaction.followup.send(chunks[0])
             
-            # Send additional chunks as separate messages
-            for chunk in chunks[1:]:
+            # Send additional chunks as separate messages, in order
+            for chunk in chunks[1:-1]:
                 await interaction.followup.send(chunk)
             
+            # The last chunk and the sources embed are independent, so send them together
+            tail_sends = [interaction.followup.send(chunks[-1])] if len(chunks) > 1 else []
+            
             # Add source information if available
-            if context_docs:
-                embed = discord.Embed(
-                    title="Information Sources",
-                    description="The response was based on these sources:",
-                    color=discord.Color.blue()
-                )
-                
-                # Add top 3 sources to the embed
-                for i, doc in enumerate(context_docs[:3], 1):
-                    source_name = doc.get('source', '').split('/')[-1] or doc.get('source', 'Unknown')
-                    doc_type = doc.get('type', 'Unknown')
-                    server = doc.get('server', '')
-                    server_text = f" | Server: {server}" if server else ""
-                    
-                    embed.add_field(
-                        name=f"Source {i}: {source_name}",
-                        value=f"Type: {doc_type}{server_text}",
-                        inline=False
-                    )
-                    
-                await interaction.followup.send(embed=embed)
+            if sources_embed := self._build_sources_embed(context_docs):
+                tail_sends.append(interaction.followup.send(embed=sources_embed))
+            
+            await asyncio.gather(*tail_sends)
     
-    async def send_formatted_dm_response(self, message: discord.Message, text: str, context_docs: List[Dict[str, Any]]):
-        """Format and send an AI response in DMs."""
-        # For DMs, we'll keep it simpler with just text chunking
-        chunks = self._chunk_text(text)
+    async def _reply_dm_error(self, channel: discord.DMChannel, placeholder: Optional[discord.Message]) -> None:
+        """Tell a DM user their message failed, in place of the response placeholder when there is one."""
+        try:
+            if placeholder is not None:
+                await placeholder.edit(content=_DM_ERROR_TEXT)
+            else:
+                await channel.send(_DM_ERROR_TEXT)
+        except discord.HTTPException as e:
+            logger.error(f"Error reporting direct message failure: {e}")
+    
+    async def _stream_dm_response(self, placeholder: discord.Message, tokens: AsyncIterator[str], limit: int = 1900) -> str:
+        """
+        Stream an AI response into DMs by editing messages as text arrives, starting with
+        the placeholder, and return the full text. If the stream fails, the user is told
+        before the error propagates.
+        """
+        channel = placeholder.channel
+        parts = []
+        buffer = ""
+        sent = placeholder
+        last_edit = time.monotonic()
         
-        # Send all chunks
-        for chunk in chunks:
-            await message.channel.send(chunk)
+        try:
+            async for token in tokens:
+                parts.append(token)
+                # Leading whitespace would leave a message blank, which Discord rejects
+                buffer = buffer + token if buffer else token.lstrip()
+                if not buffer:
+                    continue
+
+                # Finish the current message at a word boundary and continue in a new one
+                if len(buffer) > limit:
+                    while len(buffer) > limit:
+                        cut = max(buffer.rfind('\n', 0, limit), buffer.rfind(' ', 0, limit))
+                        if cut <= 0:
+                            cut = limit
+                        if sent is None:
+                            await channel.send(buffer[:cut])
+                        else:
+                            await sent.edit(content=buffer[:cut])
+                        buffer = buffer[cut:].lstrip()
+                        sent = None
+                    if buffer:
+                        sent = await channel.send(buffer)
+                    last_edit = time.monotonic()
+                    continue
+
+                # Discord rate-limits edits per message, so only refresh periodically
+                now = time.monotonic()
+                if sent is None:
+                    sent = await channel.send(buffer)
+                    last_edit = now
+                elif now - last_edit >= _STREAM_EDIT_INTERVAL:
+                    await sent.edit(content=buffer)
+                    last_edit = now
+        except Exception:
+            # Keep what was already streamed and report the failure after it
+            if sent is placeholder and not buffer:
+                await self._reply_dm_error(channel, placeholder)
+            else:
+                if sent is not None:
+                    await sent.edit(content=buffer)
+                await self._reply_dm_error(channel, None)
+            raise
+        
+        if sent is placeholder and not buffer:
+            await placeholder.edit(content="I'm sorry, I couldn't generate a response. Please try again.")
+        elif sent is not None:
+            await sent.edit(content=buffer)
+        return "".join(parts)
+    
+    def _build_sources_embed(self, context_docs: List[Dict[str, Any]]) -> Optional[discord.Embed]:
+        """Create an embed listing the top sources of a response, or None if there are none."""
+        if not context_docs:
+            return None
         
-        # Add source information if available
-        if context_docs:
-            embed = discord.Embed(
-                title="Information Sources",
-                description="The response was based on these sources:",
-                color=discord.Color.blue()
+        embed = discord.Embed(
+            title="Information Sources",
+            description="The response was based on these sources:",
+            color=discord.Color.blue()
+        )
+        
+        # Add top 3 sources to the embed
+        for i, (source_name, source_details) in enumerate(map(_describe_source, context_docs[:3]), 1):
+            embed.add_field(
+                name=f"Source {i}: {source_name}",
+                value=f"Type: {source_details}",
+                inline=False
             )
-            
-            # Add top 3 sources to the embed
-            for i, doc in enumerate(context_docs[:3], 1):
-                source_name = doc.get('source', '').split('/')[-1] or doc.get('source', 'Unknown')
-                doc_type = doc.get('type', 'Unknown')
-                server = doc.get('server', '')
-                server_text = f" | Server: {server}" if server else ""
-                
-                embed.add_field(
-                    name=f"Source {i}: {source_name}",
-                    value=f"Type: {doc_type}{server_text}",
-                    inline=False
-                )
-                
-            await message.channel.send(embed=embed)
+        
+        return embed
     
     def _chunk_text(self, text: str, limit: int = 1900) -> List[str]:
         """Split text into chunks of maximum size with smart boundaries."""
@@ -945,60 +1111,71 @@ class AshesAssistantBot(commands.Bot):
             return [text]
             
         chunks = []
-        current_chunk = ""
+        
+        # Pieces of the chunk being built and their total length; joined only when flushed
+        parts: List[str] = []
+        parts_len = 0
+        
+        def flush():
+            nonlocal parts, parts_len
+            if parts_len:
+                chunks.append("".join(parts))
+            parts = []
+            parts_len = 0
+        
+        def append(piece: str, separator: str):
+            nonlocal parts_len
+            if parts_len:
+                parts.append(separator)
+                parts_len += len(separator)
+            parts.append(piece)
+            parts_len += len(piece)
         
         # Try to split on paragraph breaks first
         paragraphs = text.split('\n\n')
         
         for paragraph in paragraphs:
             # If this paragraph would put us over the limit
-            if len(current_chunk) + len(paragraph) + 2 > limit:
+            if parts_len + len(paragraph) + 2 > limit:
                 # If the current chunk has content, add it to chunks
-                if current_chunk:
-                    chunks.append(current_chunk)
-                    current_chunk = ""
+                flush()
                 
                 # If the paragraph itself is too long, split it further
                 if len(paragraph) > limit:
                     # Split by sentences
-                    sentences = paragraph.replace('. ', '.|').replace('! ', '!|').replace('? ', '?|').split('|')
+                    sentences = _SENTENCE_SPLIT_RE.split(paragraph)
                     
                     for sentence in sentences:
-                        if len(current_chunk) + len(sentence) + 1 > limit:
-                            if current_chunk:
-                                chunks.append(current_chunk)
-                                current_chunk = ""
+                        if parts_len + len(sentence) + 1 > limit:
+                            flush()
                             
                             # If the sentence is still too long, just split by characters
                             if len(sentence) > limit:
-                                sentence_chunks = [sentence[i:i+limit] for i in range(0, len(sentence), limit)]
-                                chunks.extend(sentence_chunks[:-1])
-                                current_chunk = sentence_chunks[-1]
+                                last_start = (len(sentence) - 1) // limit * limit
+                                chunks.extend(sentence[i:i+limit] for i in range(0, last_start, limit))
+                                append(sentence[last_start:], " ")
                             else:
-                                current_chunk = sentence
+                                append(sentence, " ")
                         else:
-                            if current_chunk:
-                                current_chunk += " " + sentence
-                            else:
-                                current_chunk = sentence
+                            append(sentence, " ")
                 else:
-                    current_chunk = paragraph
+                    append(paragraph, "\n\n")
             else:
-                if current_chunk:
-                    current_chunk += "\n\n" + paragraph
-                else:
-                    current_chunk = paragraph
+                append(paragraph, "\n\n")
         
         # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(current_chunk)
+        flush()
             
         return chunks
     
     def _should_use_embed_for_response(self, text: str) -> bool:
         """Determine if the response should use an embed based on content."""
+        # If very long text, don't use embed (most will be outside anyway)
+        if len(text) > 8000:
+            return False
+        
         # Check for code blocks which might break in embeds
-        code_blocks = re.findall(r'```(?:\w+)?\n[\s\S]+?\n```', text)
+        code_blocks = _CODE_BLOCK_RE.findall(text)
         if code_blocks and len(''.join(code_blocks)) > 1000:
             return False
         
@@ -1006,84 +1183,98 @@ class AshesAssistantBot(commands.Bot):
         if text.count('\n') > 50:
             return False
             
-        # If very long text, don't use embed (most will be outside anyway)
-        if len(text) > 8000:
-            return False
-            
         return True
     
-    def _generate_response_title(self, question: str) -> str:
-        """Generate a title for the response based on the question."""
-        # Clean up the question
-        clean_question = re.sub(r'[^\w\s\?\!]', '', question).strip()
+    def _create_item_embed(self, item: Dict[str, Any]) -> discord.Embed:
+        """Create an embed for an item."""
+        embed = discord.Embed(
+            title=item['name'],
+            description=item.get('description', 'No description available.'),
+            color=self._get_rarity_color(item.get('rarity', 'common'))
+        )
         
-        # Truncate if too long
-        if len(clean_question) > 80:
-            clean_question = clean_question[:77] + "..."
-            
-        return clean_question
+        # Add image if available
+        if 'image_url' in item and item['image_url']:
+            embed.set_thumbnail(url=item['image_url'])
+        
+        # Add basic info
+        embed.add_field(name="Type", value=item.get('type', 'Unknown'), inline=True)
+        embed.add_field(name="Rarity", value=item.get('rarity', 'Common').capitalize(), inline=True)
+        embed.add_field(name="Level", value=str(item.get('level', 'N/A')), inline=True)
+        
+        # Add stats if available
+        if 'stats' in item and item['stats']:
+            stats_text = "\n".join(
+                f"**{_format_stat_name(stat_name)}:** +{value}"
+                for stat_name, value in item['stats'].items()
+            )
+            embed.add_field(name="Stats", value=stats_text, inline=False)
+        
+        # Add effects if available
+        if 'effects' in item and item['effects']:
+            effects_text = "\n".join(
+                f"**{effect.get('name', 'Effect')}:** {effect.get('description', 'No description')}"
+                for effect in item['effects']
+            )
+            embed.add_field(name="Effects", value=effects_text, inline=False)
+        
+        # Add source information
+        embed.add_field(name="Source", value=item.get('source', 'Unknown'), inline=False)
+        
+        # Add footer with retrieval info
+        embed.set_footer(text=f"Item ID: {item['id']} • Use /recipe to see crafting details if applicable")
+        
+        return embed
     
     def _get_rarity_color(self, rarity: str) -> discord.Color:
         """Get color based on item rarity."""
-        rarity = rarity.lower()
-        if rarity == "common":
-            return discord.Color.light_gray()
-        elif rarity == "uncommon":
-            return discord.Color.green()
-        elif rarity == "rare":
-            return discord.Color.blue()
-        elif rarity == "epic":
-            return discord.Color.purple()
-        elif rarity == "legendary":
-            return discord.Color.gold()
-        elif rarity == "artifact":
-            return discord.Color.red()
-        else:
-            return discord.Color.default()
+        return _RARITY_COLORS.get(rarity.lower(), _DEFAULT_COLOR)
     
     #==========================
     # Pagination helpers
     #==========================
     
-    def _create_pagination_view(self, items: List[Any], embed_creator_func: Any) -> discord.ui.View:
+    async def _create_pagination_view(self, items: List[Any], creator_name: str) -> discord.ui.View:
         """Create a pagination view for navigating through multiple items."""
-        view = discord.ui.View(timeout=300)  # 5 minute timeout
-        
-        # Previous button
-        prev_button = discord.ui.Button(
-            label="◀ Previous",
-            custom_id=f"pagination:prev",
-            style=discord.ButtonStyle.secondary,
-            disabled=True  # Disabled for first page
-        )
-        
-        # Next button
-        next_button = discord.ui.Button(
-            label="Next ▶",
-            custom_id=f"pagination:next",
-            style=discord.ButtonStyle.primary,
-            disabled=len(items) <= 1  # Disabled if only one item
-        )
-        
-        # Add buttons to view
-        view.add_item(prev_button)
-        view.add_item(next_button)
-        
         # Generate a unique ID for this pagination
-        pagination_id = str(uuid.uuid4())
-        
-        # Store pagination state
-        self.paginations[pagination_id] = {
-            "items": items,
-            "current_index": 0,
-            "embed_creator": embed_creator_func,
-            "timestamp": datetime.now().timestamp()
-        }
-        
-        # Store pagination ID in the custom IDs
-        prev_button.custom_id = f"pagination:prev:{pagination_id}"
-        next_button.custom_id = f"pagination:next:{pagination_id}"
+        pagination_id = secrets.token_urlsafe(9)
+        
+        # Store pagination state in Redis, expiring together with the view
+        cache = await self._get_binary_cache()
+        await cache.set(
+            PAGINATION_KEY.format(pagination_id=pagination_id),
+            msgpack.packb({"items": items, "index": 0, "creator": creator_name}, use_bin_type=True),
+            ex=settings.DISCORD_PAGINATION_TTL
+        )
         
+        return self._get_pagination_view(pagination_id, 0, len(items))
+    
+    def _get_pagination_view(self, pagination_id: str, current_index: int, total: int) -> discord.ui.View:
+        """Get the navigation view for a pagination, with button states for the current page."""
+        view = self._pagination_views.get(pagination_id)
+        if view is None:
+            view = discord.ui.View(timeout=settings.DISCORD_PAGINATION_TTL)
+            
+            # Previous button
+            view.add_item(discord.ui.Button(
+                label="◀ Previous",
+                custom_id=f"pagination:prev:{pagination_id}",
+                style=discord.ButtonStyle.secondary
+            ))
+            
+            # Next button
+            view.add_item(discord.ui.Button(
+                label="Next ▶",
+                custom_id=f"pagination:next:{pagination_id}",
+                style=discord.ButtonStyle.primary
+            ))
+            
+            self._pagination_views[pagination_id] = view
+        
+        # Disable buttons at either end
+        prev_button, next_button = view.children
+        prev_button.disabled = current_index == 0
+        next_button.disabled = current_index >= total - 1
         return view
     
     async def _handle_pagination(self, interaction: discord.Interaction):
@@ -1099,14 +1290,17 @@ class AshesAssistantBot(commands.Bot):
         pagination_id = parts[2]
         
         # Get pagination state
-        if pagination_id not in self.paginations:
+        cache = await self._get_binary_cache()
+        redis_key = PAGINATION_KEY.format(pagination_id=pagination_id)
+        raw = await cache.get(redis_key)
+        if raw is None:
             await interaction.response.send_message("This paginated view has expired. Please run the command again.", ephemeral=True)
             return
             
-        pagination = self.paginations[pagination_id]
-        current_index = pagination["current_index"]
+        pagination = msgpack.unpackb(raw, raw=False)
+        current_index = pagination["index"]
         items = pagination["items"]
-        embed_creator = pagination["embed_creator"]
+        embed_creator = self._pagination_creators[pagination["creator"]]
         
         # Update index based on action
         if action == "prev" and current_index > 0:
@@ -1114,34 +1308,15 @@ class AshesAssistantBot(commands.Bot):
         elif action == "next" and current_index < len(items) - 1:
             current_index += 1
         
-        # Update stored index
-        pagination["current_index"] = current_index
-        pagination["timestamp"] = datetime.now().timestamp()
+        # Store the updated index and refresh the expiry
+        pagination["index"] = current_index
+        await cache.set(redis_key, msgpack.packb(pagination, use_bin_type=True), ex=settings.DISCORD_PAGINATION_TTL)
         
         # Create new embed
         embed = await embed_creator(items[current_index], current_index + 1, len(items))
         
-        # Create new view with updated button states
-        view = discord.ui.View(timeout=300)
-        
-        prev_button = discord.ui.Button(
-            label="◀ Previous",
-            custom_id=f"pagination:prev:{pagination_id}",
-            style=discord.ButtonStyle.secondary,
-            disabled=current_index == 0
-        )
-        
-        next_button = discord.ui.Button(
-            label="Next ▶",
-            custom_id=f"pagination:next:{pagination_id}",
-            style=discord.ButtonStyle.primary,
-            disabled=current_index == len(items) - 1
-        )
-        
-        view.add_item(prev_button)
-        view.add_item(next_button)
-        
-        # Update message
+        # Update message, reusing the view with updated button states
+        view = self._get_pagination_view(pagination_id, current_index, len(items))
         await interaction.response.edit_message(embed=embed, view=view)
     
     async def _build_embed_creator(self, build: Dict[str, Any], index: int, total: int) -> discord.Embed:
@@ -1159,19 +1334,19 @@ class AshesAssistantBot(commands.Bot):
         
         # Add stats if available
         if 'stat_totals' in build:
-            stats_text = ""
-            for stat_name, value in build['stat_totals'].items():
-                formatted_name = stat_name.replace('_', ' ').title()
-                stats_text += f"**{formatted_name}:** {value}\n"
-            embed.add_field(name="Stats", value=stats_text, inline=False)
+            stats_lines = [
+                f"**{_format_stat_name(stat_name)}:** {value}"
+                for stat_name, value in build['stat_totals'].items()
+            ]
+            embed.add_field(name="Stats", value="\n".join(stats_lines), inline=False)
         
         # Add key equipment if available
         if 'items' in build and build['items']:
-            items_text = ""
-            for item in build['items'][:5]:  # Show only key items
-                rarity = item.get('rarity', 'common').capitalize()
-                items_text += f"**{item['slot']}:** {item['name']} ({rarity})\n"
-            embed.add_field(name="Key Equipment", value=items_text, inline=False)
+            items_lines = [
+                f"**{item['slot']}:** {item['name']} ({item.get('rarity', 'common').capitalize()})"
+                for item in build['items'][:5]  # Show only key items
+            ]
+            embed.add_field(name="Key Equipment", value="\n".join(items_lines), inline=False)
         
         # Add tags if available
         if 'tags' in build and build['tags']:
@@ -1186,102 +1361,88 @@ class AshesAssistantBot(commands.Bot):
     # Interactive command helpers
     #==========================
     
-    def _create_similar_items_callback(self, item: Dict[str, Any]):
-        """Create a callback for the similar items button."""
-        async def callback(interaction: discord.Interaction):
-            await interaction.response.defer(thinking=True)
-            
-            try:
-                similar_items = await item_service.get_similar_items(item['id'], limit=5)
-                
-                if not similar_items:
-                    await interaction.followup.send("No similar items found.", ephemeral=True)
-                    return
-                
-                # Create embed for similar items
-                embed = discord.Embed(
-                    title=f"Items Similar to {item['name']}",
-                    description="Here are some similar items you might be interested in:",
-                    color=discord.Color.blue()
-                )
-                
-                for similar in similar_items:
-                    # Format item details
-                    details = f"**Type:** {similar.get('type', 'Unknown')}\n"
-                    details += f"**Rarity:** {similar.get('rarity', 'Common').capitalize()}\n"
-                    details += f"**Level:** {similar.get('level', 'N/A')}\n"
-                    
-                    # Add key stats if available
-                    if 'stats' in similar and similar['stats']:
-                        stats = list(similar['stats'].items())[:3]  # Show top 3 stats
-                        stat_text = ""
-                        for stat_name, value in stats:
-                            formatted_name = stat_name.replace('_', ' ').title()
-                            stat_text += f"{formatted_name}: +{value}, "
-                        details += f"**Stats:** {stat_text.rstrip(', ')}"
-                    
-                    embed.add_field(
-                        name=similar['name'],
-                        value=details,
-                        inline=False
-                    )
-                
-                # Create view with item buttons
-                view = discord.ui.View()
-                
-                for similar in similar_items:
-                    button = discord.ui.Button(
-                        label=f"View {similar['name']}",
-                        custom_id=f"item:{similar['id']}"
-                    )
-                    button.callback = lambda i, id=similar['id']: self.item_command(i, id)
-                    view.add_item(button)
-                
-                await interaction.followup.send(embed=embed, view=view)
-                
-            except Exception as e:
-                logger.error(f"Error showing similar items: {e}")
-                await interaction.followup.send("Sorry, I encountered an error retrieving similar items.", ephemeral=True)
-        
-        return callback
-    
     async def _handle_similar_items(self, interaction: discord.Interaction, item_id: str):
         """Handle similar items button click."""
         await interaction.response.defer(thinking=True)
         
         try:
-            item = await item_service.get_item(item_id)
-            similar_callback = self._create_similar_items_callback(item)
-            await similar_callback(interaction)
-        except Exception as e:
+            similar_items = await item_service.get_similar_items(item_id, limit=5)
+            
+            if not similar_items:
+                await interaction.followup.send("No similar items found.", ephemeral=True)
+                return
+            
+            # The button sits on the item embed, whose title is the item name
+            embeds = interaction.message.embeds if interaction.message else []
+            item_name = embeds[0].title if embeds and embeds[0].title else item_id
+            
+            # Create embed for similar items
+            embed = discord.Embed(
+                title=f"Items Similar to {item_name}",
+                description="Here are some similar items you might be interested in:",
+                color=discord.Color.blue()
+            )
+            
+            for similar in similar_items:
+                # Format item details
+                details = [
+                    f"**Type:** {similar.get('type', 'Unknown')}",
+                    f"**Rarity:** {similar.get('rarity', 'Common').capitalize()}",
+                    f"**Level:** {similar.get('level', 'N/A')}",
+                ]
+                
+                # Add key stats if available
+                if 'stats' in similar and similar['stats']:
+                    stat_text = ", ".join(
+                        f"{_format_stat_name(stat_name)}: +{value}"
+                        for stat_name, value in islice(similar['stats'].items(), 3)  # Show top 3 stats
+                    )
+                    details.append(f"**Stats:** {stat_text}")
+                
+                embed.add_field(
+                    name=similar['name'],
+                    value="\n".join(details),
+                    inline=False
+                )
+            
+            # Create view with item buttons, routed by custom_id in on_interaction
+            view = discord.ui.View()
+            
+            for similar in similar_items:
+                view.add_item(discord.ui.Button(
+                    label=f"View {similar['name']}",
+                    custom_id=f"item:{similar['id']}"
+                ))
+            
+            await interaction.followup.send(embed=embed, view=view)
+            
+        except COMMAND_ERRORS as e:
             logger.error(f"Error handling similar items: {e}")
             await interaction.followup.send("Sorry, I encountered an error retrieving similar items.", ephemeral=True)
     
     async def _check_cooldown(self, interaction: discord.Interaction, command: str, cooldown_seconds: int) -> bool:
         """Check if a command is on cooldown for a user."""
-        user_id = str(interaction.user.id)
-        
-        # Initialize user cooldowns if not exist
-        if user_id not in self.cooldowns:
-            self.cooldowns[user_id] = {}
+        redis_key = COOLDOWN_KEY.format(user_id=interaction.user.id, command=command)
         
-        current_time = datetime.now().timestamp()
-        
-        # Check if command is on cooldown
-        if command in self.cooldowns[user_id]:
-            time_diff = current_time - self.cooldowns[user_id][command]
-            if time_diff < cooldown_seconds:
-                # Command is on cooldown
-                remaining = int(cooldown_seconds - time_diff)
-                await interaction.response.send_message(
-                    f"Please wait {remaining} second(s) before using this command again.",
-                    ephemeral=True
-                )
-                return False
-        
-        # Set cooldown
-        self.cooldowns[user_id][command] = current_time
-        return True
+        try:
+            # Atomically start the cooldown unless one is already running
+            cache = await self._get_cache()
+            if await cache.set(redis_key, "1", nx=True, px=cooldown_seconds * 1000):
+                return True
+            
+            remaining_ms = await cache.pttl(redis_key)
+        except COMMAND_ERRORS as e:
+            # Don't block commands when the cooldown store is unavailable
+            logger.error(f"Error checking command cooldown: {e}")
+            return True
+        
+        # Command is on cooldown
+        remaining = max(1, math.ceil(remaining_ms / 1000))
+        await interaction.response.send_message(
+            f"Please wait {remaining} second(s) before using this command again.",
+            ephemeral=True
+        )
+        return False
 
 async def start_discord_bot():
     """Start the Discord bot."""
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Annotated, Any
 import logging
@@ -16,13 +17,21 @@ from app.schemas.auth import (
 )
 from app.crud.users import (
     create_user, 
+    email_exists, 
     authenticate_user, 
     get_user_by_email, 
     update_user_password
 )
 from app.services.email import send_password_reset_email
+from app.services.email_queue import enqueue_password_reset_email
+from app.services.exceptions import ServiceError
+from redis.exceptions import RedisError
 from app.core.security import (
+    oauth2_scheme,
     create_access_token, 
+    create_refresh_token,
+    decode_refresh_token,
+    consume_refresh_token,
     verify_password_reset_token, 
     create_password_reset_token,
     get_current_user
@@ -35,14 +44,13 @@ logger = logging.getLogger(__name__)
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_in: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Register a new user.
     """
     # Check if user with this email already exists
-    db_user = get_user_by_email(db, email=user_in.email)
-    if db_user:
+    if await email_exists(db, email=user_in.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="User with this email already exists"
@@ -50,8 +58,15 @@ async def register_user(
 
     # Create new user
     try:
-        user = create_user(db=db, user_create=user_in)
+        user = await create_user(db=db, user_create=user_in)
         return user
+    except IntegrityError:
+        # Lost a race with a concurrent registration, or the username is taken
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email or username already exists"
+        )
     except Exception as e:
         logger.error(f"Error creating user: {str(e)}")
         raise HTTPException(
@@ -62,12 +77,12 @@ async def register_user(
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -85,45 +100,96 @@ async def login_for_access_token(
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": UserRead.from_orm(user)
+        "refresh_token": await _issue_refresh_token(user.id, user.email),
+        "user": UserRead.model_validate(user).model_dump()
     }
 
+async def _issue_refresh_token(user_id: int, email: str):
+    """Create a refresh token, or None if Redis is unavailable (the access token still works)."""
+    try:
+        return await create_refresh_token(user_id=user_id, email=email)
+    except (ServiceError, RedisError) as e:
+        logger.error(f"Error creating refresh token: {str(e)}")
+        return None
+
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
-    current_user: UserRead = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Refresh access token.
+    
+    Accepts a refresh token, which is rotated using Redis alone, or a still-valid access token,
+    which only gets a new access token (never a refresh token, so it can't outlive a revocation).
     """
-    # Create new access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    
+    jti = decode_refresh_token(token)
+    if jti is None:
+        # An access token: verify it the usual way
+        current_user = await get_current_user(token=token, db=db)
+        access_token = create_access_token(
+            data={"sub": current_user.email, "user_id": current_user.id},
+            expires_delta=access_token_expires
+        )
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "user": current_user
+        }
+    
+    # A refresh token is single use: consuming it also rejects replays
+    try:
+        record = await consume_refresh_token(jti)
+    except (ServiceError, RedisError) as e:
+        logger.error(f"Error reading refresh token: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token refresh is temporarily unavailable"
+        )
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     access_token = create_access_token(
-        data={"sub": current_user.email, "user_id": current_user.id},
+        data={"sub": record["email"], "user_id": record["user_id"]},
         expires_delta=access_token_expires
     )
-    
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": current_user
+        "refresh_token": await _issue_refresh_token(record["user_id"], record["email"])
     }
 
 @router.post("/forgot-password", response_model=None, status_code=status.HTTP_204_NO_CONTENT)
 async def forgot_password(
     request: PasswordResetRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Send a password reset email to the user.
     """
-    user = get_user_by_email(db, email=request.email)
+    user = await get_user_by_email(db, email=request.email)
     if user:
         # Create password reset token
         token = create_password_reset_token(email=user.email)
         
-        # Send password reset email in the background
+        # Hand the email to the email worker if one runs; send it in-process otherwise or if the queue is down
+        if settings.EMAIL_QUEUE_ENABLED:
+            try:
+                await enqueue_password_reset_email(
+                    email_to=user.email,
+                    token=token,
+                    username=user.username
+                )
+                return None
+            except (ServiceError, RedisError) as e:
+                logger.error(f"Error queueing password reset email: {str(e)}")
         background_tasks.add_task(
             send_password_reset_email,
             email_to=user.email,
@@ -137,7 +203,7 @@ async def forgot_password(
 @router.post("/reset-password", response_model=None, status_code=status.HTTP_204_NO_CONTENT)
 async def reset_password(
     reset_data: PasswordReset,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Reset user password using a reset token.
@@ -149,7 +215,7 @@ async def reset_password(
             detail="Invalid or expired token"
         )
     
-    user = get_user_by_email(db, email=email)
+    user = await get_user_by_email(db, email=email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -157,7 +223,7 @@ async def reset_password(
         )
     
     # Update user password
-    update_user_password(db, user_id=user.id, new_password=reset_data.password)
+    await update_user_password(db, user_id=user.id, new_password=reset_data.password)
     
     return None
 
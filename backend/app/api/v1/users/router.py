@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any
 
 from app.db.session import get_db
@@ -9,15 +10,14 @@ from app.schemas.users import (
     UserPasswordUpdate,
     UserPreferences
 )
-from app.schemas.auth import TokenData
+from app.schemas.auth import TokenData, CurrentUser
 from app.crud.users import (
-    update_user,
-    get_user,
-    update_user_password,
-    get_user_preferences,
+    email_exists,
+    update_user_by_id,
+    change_user_password,
     update_user_preferences
 )
-from app.core.security import get_current_user, get_password_hash, verify_password
+from app.core.security import get_current_user
 
 router = APIRouter()
 
@@ -34,69 +34,79 @@ async def read_user_me(
 async def update_user_profile(
     user_in: UserUpdate,
     current_user: UserRead = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Update current user profile.
     """
-    # If updating email, check it's not already taken
+    # If updating email, check it's not already taken. Emails compare case-insensitively (citext),
+    # so a change of case only matches the user's own row, which is excluded.
     if user_in.email and user_in.email != current_user.email:
-        from app.crud.users import get_user_by_email
-        if get_user_by_email(db, email=user_in.email):
+        if await email_exists(db, email=user_in.email, exclude_user_id=current_user.id):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered"
             )
             
-    # Get current user from database
-    user = get_user(db, user_id=current_user.id)
+    # Update user
+    update_data = {
+        field: value
+        for field, value in user_in.dict(exclude_unset=True).items()
+        if value is not None
+    }
+    try:
+        user = await update_user_by_id(db, user_id=current_user.id, values=update_data)
+    except IntegrityError:
+        # The email or username was taken concurrently
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email or username already registered"
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-        
-    # Update user
-    user = update_user(db, db_obj=user, obj_in=user_in)
     return user
 
 @router.put("/password", response_model=None, status_code=status.HTTP_204_NO_CONTENT)
 async def update_password(
     password_update: UserPasswordUpdate,
     current_user: UserRead = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Update current user password.
     """
-    # Get user from database
-    user = get_user(db, user_id=current_user.id)
-    if not user:
+    # Verify current password and update it
+    changed = await change_user_password(
+        db,
+        user_id=current_user.id,
+        current_password=password_update.current_password,
+        new_password=password_update.new_password
+    )
+    if changed is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    # Verify current password
-    if not verify_password(password_update.current_password, user.hashed_password):
+    if not changed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
         )
-    
-    # Update password
-    update_user_password(db, user_id=user.id, new_password=password_update.new_password)
     return None
 
 @router.get("/preferences", response_model=UserPreferences)
 async def get_preferences(
-    current_user: UserRead = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """
     Get current user preferences.
     """
-    preferences = get_user_preferences(db, user_id=current_user.id)
+    # Preferences are loaded along with the current user
+    preferences = current_user.preferences
     if not preferences:
         # Return default preferences if none are set
         return UserPreferences(
@@ -111,12 +121,12 @@ async def get_preferences(
 async def update_preferences(
     preferences: UserPreferences,
     current_user: UserRead = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Update current user preferences.
     """
-    updated_preferences = update_user_preferences(
+    updated_preferences = await update_user_preferences(
         db, 
         user_id=current_user.id, 
         preferences=preferences
@@ -125,21 +135,12 @@ async def update_preferences(
 
 @router.get("/subscription")
 async def get_subscription(
-    current_user: UserRead = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserRead = Depends(get_current_user)
 ) -> Any:
     """
     Get current user subscription information.
     """
-    # Get user from database to check if premium
-    user = get_user(db, user_id=current_user.id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    if not user.is_premium:
+    if not current_user.is_premium:
         return {
             "plan": "Free",
             "is_active": True
@@ -10,7 +10,11 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60  # 1 hour
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     PASSWORD_RESET_TOKEN_EXPIRE_HOURS: int = 24  # 24 hours
+    CURRENT_USER_CACHE_SIZE: int = 10000
+    CURRENT_USER_CACHE_TTL: int = 60  # seconds a verified token's user is reused
+    WORKER_THREAD_LIMIT: int = 100  # threads for password hashing and other blocking calls
     
     # CORS configuration
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost", "http://localhost:3000", "http://localhost:8000", "http://nginx", "http://orpheus", "http://orpheus:3000", "http://orpheus:8000", "*"]
@@ -31,6 +35,10 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "app")
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    # Per worker process; keep pool_size * workers below the server's max_connections
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 minutes
 
     @model_validator(mode='before')
     @classmethod
@@ -53,8 +61,17 @@ class Settings(BaseSettings):
     SMTP_HOST: Optional[str] = None
     SMTP_USER: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
+    # Reconnect before providers cap messages per connection or drop idle sessions
+    SMTP_MAX_MSGS_PER_CONN: int = 100
+    SMTP_MAX_CONN_AGE_S: float = 60.0
+    SMTP_POOL_SIZE: int = 5
+    # Bound every SMTP command so a stuck server can't hang a sender
+    SMTP_TIMEOUT_S: float = 30.0
     EMAILS_FROM_EMAIL: Optional[EmailStr] = None
     EMAILS_FROM_NAME: Optional[str] = None
+    # Queue emails for `python -m app.services.email_queue`; only enable where that worker runs,
+    # otherwise emails are sent from the API process after the response
+    EMAIL_QUEUE_ENABLED: bool = False
     
     # Redis configuration
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
@@ -76,6 +93,20 @@ class Settings(BaseSettings):
     APP_NAME: str = "MyAshes.ai"
     WEBSITE_URL: str = os.getenv("WEBSITE_URL", "https://myashes.ai")
 
+    # Discord bot cache configuration
+    DISCORD_CHAT_HISTORY_LENGTH: int = int(os.getenv("DISCORD_CHAT_HISTORY_LENGTH", "20"))
+    DISCORD_CHAT_HISTORY_TTL: int = int(os.getenv("DISCORD_CHAT_HISTORY_TTL", "86400"))  # 24 hours
+    DISCORD_PAGINATION_TTL: int = int(os.getenv("DISCORD_PAGINATION_TTL", "300"))  # 5 minutes, also the view timeout
+    DISCORD_PAGINATION_VIEW_CACHE_SIZE: int = int(os.getenv("DISCORD_PAGINATION_VIEW_CACHE_SIZE", "1000"))
+    DISCORD_AUTOCOMPLETE_CACHE_SIZE: int = int(os.getenv("DISCORD_AUTOCOMPLETE_CACHE_SIZE", "2048"))
+    DISCORD_AUTOCOMPLETE_TTL: int = int(os.getenv("DISCORD_AUTOCOMPLETE_TTL", "30"))
+    DISCORD_SERVER_LIST_TTL: int = int(os.getenv("DISCORD_SERVER_LIST_TTL", "300"))  # 5 minutes
+    DISCORD_LOOKUP_CACHE_SIZE: int = int(os.getenv("DISCORD_LOOKUP_CACHE_SIZE", "1024"))
+    DISCORD_LOOKUP_TTL: int = int(os.getenv("DISCORD_LOOKUP_TTL", "300"))  # 5 minutes
+    DISCORD_EMBED_CACHE_TTL: int = int(os.getenv("DISCORD_EMBED_CACHE_TTL", "600"))  # 10 minutes
+    DISCORD_SERVER_CONTEXT_CACHE_SIZE: int = int(os.getenv("DISCORD_SERVER_CONTEXT_CACHE_SIZE", "10000"))
+    DISCORD_SERVER_CONTEXT_TTL: int = int(os.getenv("DISCORD_SERVER_CONTEXT_TTL", "60"))
+
     model_config = ConfigDict(case_sensitive=True)
 
 
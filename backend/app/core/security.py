@@ -1,37 +1,106 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Union
-from jose import jwt
+import hashlib
+import secrets
+import time
+import anyio
+from cachetools import TTLCache
+from jose import jwk, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.db.session import get_db
 from app.schemas.auth import TokenData
+from app.services.cache_service import get_cache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: argon2id for new hashes, existing bcrypt hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    default="argon2",
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,  # KiB
+    argon2__parallelism=1
+)
+
+# Verified against when a login email is unknown, so that path costs the same as a real check
+DUMMY_PASSWORD_HASH = pwd_context.hash("x" * 32)
+
+# Signing key built once; jose reuses Key objects instead of re-parsing the secret per call
+_JWT_KEY = jwk.construct(settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 # OAuth2 token handling
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Redis hash per live refresh token: {user_id, email, generation}; deleted when the token is used
+REFRESH_TOKEN_KEY = "auth:refresh:{jti}"
+
+# Counter bumped to revoke every refresh token a user holds; tokens from older generations are rejected.
+# Never expires: restarting the count would bring revoked generations back.
+REFRESH_GENERATION_KEY = "auth:refresh_generation:{user_id}"
+
+# Version stamp replaced whenever a user changes, so every worker's cached copies of them go stale.
+# Stamps are never reused, so the key may expire once no cache entry could still hold the old one.
+USER_VERSION_KEY = "auth:user_version:{user_id}"
+
+# Verified tokens -> (UserRead, token expiry, user version), so repeat requests skip the decode
+# and user query. Keyed by a short digest of the token to bound memory.
+_current_user_cache = TTLCache(maxsize=settings.CURRENT_USER_CACHE_SIZE, ttl=settings.CURRENT_USER_CACHE_TTL)
+
+
+# Marks a user whose version couldn't be read, so it isn't cached
+_UNCACHEABLE = object()
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+async def _get_user_version(user_id: int) -> Optional[str]:
+    cache = await get_cache()
+    return await cache.get(USER_VERSION_KEY.format(user_id=user_id))
+
+
+async def invalidate_cached_user(user_id: int) -> None:
+    """
+    Drop cached users for a user ID after their profile or password changes, in every worker.
+    """
+    for key, (user, _, _) in list(_current_user_cache.items()):
+        if user.id == user_id:
+            _current_user_cache.pop(key, None)
+    
+    # A fresh stamp, unlike a counter, can't repeat a version still cached after the key expired
+    try:
+        cache = await get_cache()
+        await cache.set(
+            USER_VERSION_KEY.format(user_id=user_id),
+            str(time.time_ns()),
+            ex=int(settings.CURRENT_USER_CACHE_TTL) * 2
+        )
+    except RedisError as e:
+        logger.error(f"Error invalidating cached user {user_id}: {e}")
+
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against a hash.
+    Verify a password against a hash, in a worker thread to keep the event loop free.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await anyio.to_thread.run_sync(pwd_context.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using argon2id, in a worker thread to keep the event loop free.
     """
-    return pwd_context.hash(password)
+    return await anyio.to_thread.run_sync(pwd_context.hash, password)
 
 
 def create_access_token(
@@ -52,12 +121,88 @@ def create_access_token(
     
     encoded_jwt = jwt.encode(
         to_encode, 
-        settings.SECRET_KEY, 
+        _JWT_KEY, 
         algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
+async def create_refresh_token(user_id: int, email: str) -> str:
+    """
+    Create a single-use refresh token, recorded in Redis until it expires.
+    """
+    jti = secrets.token_urlsafe(16)
+    expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    
+    # The user is looked up from Redis, so the token itself only carries its ID
+    to_encode = {"jti": jti, "exp": datetime.utcnow() + expires_delta, "type": "refresh"}
+    encoded_jwt = jwt.encode(
+        to_encode, 
+        _JWT_KEY, 
+        algorithm=settings.ALGORITHM
+    )
+    
+    cache = await get_cache()
+    redis_key = REFRESH_TOKEN_KEY.format(jti=jti)
+    generation = await cache.get(REFRESH_GENERATION_KEY.format(user_id=user_id)) or "0"
+    async with cache.pipeline(transaction=True) as pipe:
+        pipe.hset(redis_key, mapping={"user_id": user_id, "email": email, "generation": generation})
+        pipe.expire(redis_key, int(expires_delta.total_seconds()))
+        await pipe.execute()
+    
+    return encoded_jwt
+
+
+def decode_refresh_token(token: str) -> Optional[str]:
+    """
+    Verify a refresh token and return its ID, or None if it isn't a valid refresh token.
+    """
+    try:
+        payload = jwt.decode(
+            token, 
+            _JWT_KEY, 
+            algorithms=[settings.ALGORITHM]
+        )
+    except jwt.JWTError:
+        return None
+    
+    if payload.get("type") != "refresh":
+        return None
+    return payload.get("jti")
+
+
+async def consume_refresh_token(jti: str) -> Optional[Dict[str, Any]]:
+    """
+    Atomically read and delete a refresh token's record, returning None if it was
+    already used, has expired or was revoked.
+    """
+    cache = await get_cache()
+    redis_key = REFRESH_TOKEN_KEY.format(jti=jti)
+    async with cache.pipeline(transaction=True) as pipe:
+        pipe.hgetall(redis_key)
+        pipe.delete(redis_key)
+        record, _ = await pipe.execute()
+    
+    if not record:
+        return None
+    
+    generation = await cache.get(REFRESH_GENERATION_KEY.format(user_id=record["user_id"])) or "0"
+    if record.get("generation", "0") != generation:
+        return None
+    return {"user_id": int(record["user_id"]), "email": record["email"]}
+
+
+async def revoke_refresh_tokens(user_id: int) -> None:
+    """
+    Revoke every refresh token a user holds, e.g. after a password change or deactivation.
+    """
+    try:
+        cache = await get_cache()
+        await cache.incr(REFRESH_GENERATION_KEY.format(user_id=user_id))
+    except RedisError as e:
+        logger.error(f"Error revoking refresh tokens of user {user_id}: {e}")
+
+
 def create_password_reset_token(email: str) -> str:
     """
     Create a password reset token.
@@ -66,7 +211,7 @@ def create_password_reset_token(email: str) -> str:
     to_encode = {"sub": email, "exp": expires, "type": "password_reset"}
     encoded_jwt = jwt.encode(
         to_encode, 
-        settings.SECRET_KEY, 
+        _JWT_KEY, 
         algorithm=settings.ALGORITHM
     )
     return encoded_jwt
@@ -79,7 +224,7 @@ def verify_password_reset_token(token: str) -> Optional[str]:
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
+            _JWT_KEY, 
             algorithms=[settings.ALGORITHM]
         )
         token_type = payload.get("type")
@@ -94,11 +239,21 @@ def verify_password_reset_token(token: str) -> Optional[str]:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Verify access token and return current user.
     """
+    # Reuse the user of a recently verified token until it expires or the user changes
+    cache_key = _token_cache_key(token)
+    cached = _current_user_cache.get(cache_key)
+    if cached is not None and cached[1] > time.time():
+        try:
+            if await _get_user_version(cached[0].id) == cached[2]:
+                return cached[0]
+        except RedisError as e:
+            logger.error(f"Error checking cached user version: {e}")
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -107,12 +262,13 @@ async def get_current_user(
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
+            _JWT_KEY, 
             algorithms=[settings.ALGORITHM]
         )
         email: str = payload.get("sub")
         user_id: int = payload.get("user_id")
-        if email is None or user_id is None:
+        # Only access tokens (no "type" claim) authenticate requests
+        if email is None or user_id is None or payload.get("type") is not None:
             raise credentials_exception
         
         token_data = TokenData(email=email, user_id=user_id)
@@ -120,9 +276,16 @@ async def get_current_user(
         logger.error(f"JWT error: {str(e)}")
         raise credentials_exception
     
+    # Read before the user, so a change committed in between leaves this entry stale
+    try:
+        version = await _get_user_version(token_data.user_id)
+    except RedisError as e:
+        logger.error(f"Error reading user version: {e}")
+        version = _UNCACHEABLE
+    
     # Get user from database
     from app.crud.users import get_user
-    user = get_user(db, user_id=token_data.user_id)
+    user = await get_user(db, user_id=token_data.user_id)
     if user is None:
         raise credentials_exception
     
@@ -133,5 +296,8 @@ async def get_current_user(
             detail="Inactive user"
         )
     
-    from app.schemas.auth import UserRead
-    return UserRead.from_orm(user)
+    from app.schemas.auth import CurrentUser
+    user_read = CurrentUser.model_validate(user)
+    if version is not _UNCACHEABLE:
+        _current_user_cache[cache_key] = (user_read, payload["exp"], version)
+    return user_read
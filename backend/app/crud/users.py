@@ -1,34 +1,69 @@
 from typing import Any, Dict, Optional, Union
-from sqlalchemy.orm import Session
-
-from app.core.security import get_password_hash, verify_password
+from sqlalchemy import Row, exists, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.security import (
+    DUMMY_PASSWORD_HASH,
+    get_password_hash,
+    verify_password,
+    invalidate_cached_user,
+    revoke_refresh_tokens
+)
 from app.models.user import User, UserPreference
 from app.schemas.auth import UserCreate
 from app.schemas.users import UserUpdate, UserPreferences
 
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
     """
-    Get a user by ID.
+    Get a user by ID, with their preferences.
     """
-    return db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(
+        select(User).options(joinedload(User.preferences)).where(User.id == user_id)
+    )
+    return result.scalar_one_or_none()
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """
     Get a user by email.
     """
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
+
+
+async def get_user_auth_cols(db: AsyncSession, email: str) -> Optional[Row]:
+    """
+    Get only the columns needed to check a login, served from the covering email index.
+    """
+    result = await db.execute(
+        select(User.id, User.email, User.hashed_password, User.is_active).where(User.email == email)
+    )
+    return result.first()
 
 
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
+async def email_exists(db: AsyncSession, email: str, exclude_user_id: Optional[int] = None) -> bool:
+    """
+    Check whether a user with this email exists, without loading the row.
+    Pass exclude_user_id to ignore that user's own row.
+    """
+    condition = User.email == email
+    if exclude_user_id is not None:
+        condition = condition & (User.id != exclude_user_id)
+    return await db.scalar(select(exists().where(condition)))
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
     """
     Get a user by username.
     """
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalar_one_or_none()
 
 
-def create_user(db: Session, user_create: UserCreate) -> User:
+async def create_user(db: AsyncSession, user_create: UserCreate) -> User:
     """
     Create a new user.
     """
@@ -36,11 +71,11 @@ def create_user(db: Session, user_create: UserCreate) -> User:
     db_user = User(
         email=user_create.email,
         username=user_create.username,
-        hashed_password=get_password_hash(user_create.password),
+        hashed_password=await get_password_hash(user_create.password),
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    # Flush to get the user ID, then commit both rows in one transaction
+    await db.flush()
     
     # Create default preferences
     db_preferences = UserPreference(
@@ -51,25 +86,29 @@ def create_user(db: Session, user_create: UserCreate) -> User:
         compact_layout=False
     )
     db.add(db_preferences)
-    db.commit()
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user.
     """
-    user = get_user_by_email(db, email=email)
-    if not user:
+    credentials = await get_user_auth_cols(db, email=email)
+    if not credentials:
+        # Still hash, so unknown emails can't be told apart by response time
+        await verify_password(password, DUMMY_PASSWORD_HASH)
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, credentials.hashed_password):
         return None
-    return user
+    # Only a successful login needs the full user, to render it
+    return await get_user(db, user_id=credentials.id)
 
 
-def update_user(
-    db: Session, 
+async def update_user(
+    db: AsyncSession, 
     db_obj: User,
     obj_in: Union[UserUpdate, Dict[str, Any]]
 ) -> User:
@@ -83,33 +122,76 @@ def update_user(
             setattr(db_obj, field, update_data[field])
             
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await invalidate_cached_user(db_obj.id)
+    if update_data.get("is_active") is False:
+        await revoke_refresh_tokens(db_obj.id)
     return db_obj
 
 
-def update_user_password(db: Session, user_id: int, new_password: str) -> User:
+async def update_user_by_id(db: AsyncSession, user_id: int, values: Dict[str, Any]) -> Optional[User]:
+    """
+    Update a user's columns in a single UPDATE ... RETURNING statement.
+    """
+    if not values:
+        return await get_user(db, user_id=user_id)
+    
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(**values).returning(User)
+    )
+    user = result.scalar_one_or_none()
+    await db.commit()
+    await invalidate_cached_user(user_id)
+    # Sessions don't survive a new password or deactivation
+    if "hashed_password" in values or values.get("is_active") is False:
+        await revoke_refresh_tokens(user_id)
+    return user
+
+
+async def update_user_password(db: AsyncSession, user_id: int, new_password: str) -> Optional[User]:
     """
     Update a user's password.
     """
-    user = get_user(db, user_id=user_id)
-    if not user:
+    hashed_password = await get_password_hash(new_password)
+    return await update_user_by_id(db, user_id, {"hashed_password": hashed_password})
+
+
+async def change_user_password(
+    db: AsyncSession,
+    user_id: int,
+    current_password: str,
+    new_password: str
+) -> Optional[bool]:
+    """
+    Change a user's password after checking the current one, in one transaction.
+    Returns None if the user doesn't exist and False if the current password is wrong.
+    """
+    result = await db.execute(
+        select(User.hashed_password).where(User.id == user_id).with_for_update()
+    )
+    hashed_password = result.scalar_one_or_none()
+    if hashed_password is None:
         return None
-        
-    hashed_password = get_password_hash(new_password)
-    user.hashed_password = hashed_password
     
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    if not await verify_password(current_password, hashed_password):
+        await db.rollback()
+        return False
+    
+    new_hash = await get_password_hash(new_password)
+    await db.execute(update(User).where(User.id == user_id).values(hashed_password=new_hash))
+    await db.commit()
+    await invalidate_cached_user(user_id)
+    await revoke_refresh_tokens(user_id)
+    return True
 
 
-def get_user_preferences(db: Session, user_id: int) -> Optional[UserPreferences]:
+async def get_user_preferences(db: AsyncSession, user_id: int) -> Optional[UserPreferences]:
     """
     Get a user's preferences.
     """
-    preferences = db.query(UserPreference).filter(UserPreference.user_id == user_id).first()
+    result = await db.execute(select(UserPreference).where(UserPreference.user_id == user_id))
+    preferences = result.scalar_one_or_none()
     if not preferences:
         return None
         
@@ -122,39 +204,42 @@ def get_user_preferences(db: Session, user_id: int) -> Optional[UserPreferences]
     )
 
 
-def update_user_preferences(
-    db: Session, 
+async def update_user_preferences(
+    db: AsyncSession, 
     user_id: int, 
     preferences: UserPreferences
 ) -> UserPreferences:
     """
     Update a user's preferences.
     """
-    db_preferences = db.query(UserPreference).filter(UserPreference.user_id == user_id).first()
+    values = {
+        "email_notifications": preferences.email_notifications,
+        "discord_notifications": preferences.discord_notifications,
+        "dark_mode": preferences.dark_mode,
+        "compact_layout": preferences.compact_layout,
+    }
+    # Existing additional preferences are only replaced when new ones are given
+    update_values = dict(values)
+    if preferences.additional_preferences:
+        update_values["additional_preferences"] = preferences.additional_preferences
     
-    if not db_preferences:
-        # Create preferences if they don't exist
-        db_preferences = UserPreference(
+    # Create or update the row in one statement
+    stmt = (
+        insert(UserPreference)
+        .values(
             user_id=user_id,
-            email_notifications=preferences.email_notifications,
-            discord_notifications=preferences.discord_notifications,
-            dark_mode=preferences.dark_mode,
-            compact_layout=preferences.compact_layout,
-            additional_preferences=preferences.additional_preferences or {}
+            additional_preferences=preferences.additional_preferences or {},
+            **values
         )
-        db.add(db_preferences)
-    else:
-        # Update existing preferences
-        db_preferences.email_notifications = preferences.email_notifications
-        db_preferences.discord_notifications = preferences.discord_notifications
-        db_preferences.dark_mode = preferences.dark_mode
-        db_preferences.compact_layout = preferences.compact_layout
-        
-        if preferences.additional_preferences:
-            db_preferences.additional_preferences = preferences.additional_preferences
+        .on_conflict_do_update(index_elements=["user_id"], set_=update_values)
+        .returning(UserPreference)
+        # The row may already be in the session, loaded with the current user
+        .execution_options(populate_existing=True)
+    )
+    db_preferences = (await db.execute(stmt)).scalar_one()
     
-    db.commit()
-    db.refresh(db_preferences)
+    await db.commit()
+    await invalidate_cached_user(user_id)
     
     return UserPreferences(
         email_notifications=db_preferences.email_notifications,
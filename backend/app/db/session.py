@@ -1,20 +1,25 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
+# The sync URI is kept for Alembic; the app talks to the database through asyncpg
+engine = create_async_engine(
+    settings.SQLALCHEMY_DATABASE_URI.replace("postgresql://", "postgresql+asyncpg://", 1),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,
+    pool_use_lifo=True,
+    connect_args={
+        # Short OLTP queries don't benefit from JIT compilation
+        "server_settings": {"jit": "off"},
+        "prepared_statement_cache_size": 512
+    },
     echo=settings.DEBUG
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 # Dependency to get DB session
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncSession:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
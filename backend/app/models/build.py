@@ -1,20 +1,32 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, FetchedValue, ForeignKey, Index, String, DateTime, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
 from app.db.base_class import Base
 
 class Build(Base):
     __tablename__ = "builds"
+    __table_args__ = (
+        # Covers listing a user's builds, newest first, without heap lookups
+        Index(
+            "ix_builds_user_updated",
+            "user_id",
+            text("updated_at DESC"),
+            postgresql_include=["name", "is_public"]
+        ),
+        Index("ix_builds_data_gin", "data", postgresql_using="gin"),
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     name = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
-    data = Column(JSON, nullable=False)
+    data = Column(JSONB, nullable=False)
     is_public = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
     user = relationship("User", back_populates="builds")
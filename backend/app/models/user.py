@@ -1,23 +1,34 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, FetchedValue, ForeignKey, Index, String, DateTime, Text, func, text
+from sqlalchemy.dialects.postgresql import CITEXT, JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
 from app.db.base_class import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Covers the login lookup so it is answered by an index-only scan
+        Index(
+            "ix_users_email",
+            "email",
+            unique=True,
+            postgresql_include=["id", "hashed_password", "is_active"]
+        ),
+    )
+    # Read server-set timestamps back via RETURNING; a lazy refresh can't run under asyncio
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
-    username = Column(String, unique=True, index=True, nullable=False)
+    id = Column(BigInteger, primary_key=True)
+    email = Column(CITEXT, nullable=False)
+    username = Column(CITEXT, unique=True, index=True, nullable=False)
     display_name = Column(String, index=True)
     hashed_password = Column(String, nullable=False)
     bio = Column(Text)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     is_premium = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
     preferences = relationship("UserPreference", back_populates="user", uselist=False)
@@ -27,9 +38,13 @@ class User(Base):
 
 class UserPreference(Base):
     __tablename__ = "user_preferences"
+    __table_args__ = (
+        Index("ix_user_preferences_additional_gin", "additional_preferences", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True)
+    id = Column(BigInteger, primary_key=True, index=True)
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), unique=True)
     
     # Notification preferences
     email_notifications = Column(Boolean, default=True)
@@ -39,11 +54,11 @@ class UserPreference(Base):
     dark_mode = Column(Boolean, default=False)
     compact_layout = Column(Boolean, default=False)
     
-    # Additional preferences as JSON
-    additional_preferences = Column(JSON, default={})
+    # Additional preferences as JSON; the server fills in an empty object
+    additional_preferences = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
     
     # Last updated timestamp
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
     user = relationship("User", back_populates="preferences")
@@ -51,12 +66,17 @@ class UserPreference(Base):
 
 class SavedItem(Base):
     __tablename__ = "saved_items"
+    __table_args__ = (
+        Index("ix_saved_items_user_created", "user_id", text("created_at DESC")),
+        # Spread per-user lists over hash partitions; the key must be part of the primary key
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     item_id = Column(String, nullable=False)  # Reference to game item ID
     notes = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="saved_items")
@@ -1,6 +1,11 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 from typing import Optional
 from datetime import datetime
+import re
+
+from app.schemas.users import UserPreferences
+
+_HAS_DIGIT = re.compile(r"\d").search
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -15,11 +20,9 @@ class UserCreate(UserBase):
     def password_complexity(cls, v):
         """
         Validate password complexity.
-        At least 8 characters long and contains at least one digit.
+        Must contain at least one digit; Field(min_length=8) enforces the length.
         """
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):
+        if not _HAS_DIGIT(v):
             raise ValueError('Password must contain at least one digit')
         return v
 
@@ -36,10 +39,16 @@ class UserRead(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CurrentUser(UserRead):
+    """The authenticated user, with preferences loaded in the same query."""
+    preferences: Optional[UserPreferences] = None
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
-    user: UserRead
+    refresh_token: Optional[str] = None
+    user: Optional[UserRead] = None
 
 
 class TokenData(BaseModel):
@@ -60,10 +69,8 @@ class PasswordReset(BaseModel):
     def password_complexity(cls, v):
         """
         Validate password complexity.
-        At least 8 characters long and contains at least one digit.
+        Must contain at least one digit; Field(min_length=8) enforces the length.
         """
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):
+        if not _HAS_DIGIT(v):
             raise ValueError('Password must contain at least one digit')
         return v
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
+import re
+
+_HAS_DIGIT = re.compile(r"\d").search
 
 class UserBase(BaseModel):
     username: str
@@ -35,11 +38,9 @@ class UserPasswordUpdate(BaseModel):
     def password_complexity(cls, v):
         """
         Validate password complexity.
-        At least 8 characters long and contains at least one digit.
+        Must contain at least one digit; Field(min_length=8) enforces the length.
         """
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):
+        if not _HAS_DIGIT(v):
             raise ValueError('Password must contain at least one digit')
         return v
 
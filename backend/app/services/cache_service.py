@@ -1,35 +1,51 @@
 import redis.asyncio as redis
 from app.config import settings
 from loguru import logger
+from app.services.exceptions import ServiceError
 from typing import Any, Optional
-import json
+import orjson
 
-# Global redis client
+# Global redis clients
 _redis_client = None
+_binary_redis_client = None
+
+async def _connect(decode_responses: bool) -> redis.Redis:
+    """Create a Redis client and verify the connection."""
+    try:
+        client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            db=settings.REDIS_DB,
+            decode_responses=decode_responses,
+            encoding="utf-8"
+        )
+        # Test connection
+        await client.ping()
+        logger.info(f"Connected to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+        return client
+    except Exception as e:
+        logger.error(f"Failed to connect to Redis: {e}")
+        raise ServiceError(f"Failed to connect to Redis: {e}") from e
 
 async def get_cache():
     """Get the Redis cache client."""
     global _redis_client
     
     if _redis_client is None:
-        try:
-            _redis_client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                password=settings.REDIS_PASSWORD,
-                db=settings.REDIS_DB,
-                decode_responses=True,
-                encoding="utf-8"
-            )
-            # Test connection
-            await _redis_client.ping()
-            logger.info(f"Connected to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
-        except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            raise
+        _redis_client = await _connect(decode_responses=True)
     
     return _redis_client
 
+async def get_binary_cache():
+    """Get a Redis client that returns raw bytes, for binary (e.g. msgpack) values."""
+    global _binary_redis_client
+    
+    if _binary_redis_client is None:
+        _binary_redis_client = await _connect(decode_responses=False)
+    
+    return _binary_redis_client
+
 async def set_cache(key: str, value: Any, expire: int = 3600) -> bool:
     """
     Set a value in the cache.
@@ -47,7 +63,7 @@ async def set_cache(key: str, value: Any, expire: int = 3600) -> bool:
     try:
         # Serialize value to JSON if it's not a primitive type
         if isinstance(value, (dict, list, tuple)):
-            value = json.dumps(value)
+            value = orjson.dumps(value)
         
         # Set the value with expiration
         await cache.set(key, value, ex=expire)
@@ -78,8 +94,8 @@ async def get_cache_value(key: str, default: Any = None) -> Optional[Any]:
         
         # Try to parse as JSON, return raw value if not JSON
         try:
-            return json.loads(value)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(value)
+        except (orjson.JSONDecodeError, TypeError):
             return value
     except Exception as e:
         logger.error(f"Error getting cache key {key}: {e}")
@@ -1,98 +1,314 @@
+import asyncio
 import logging
-import smtplib
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import aiosmtplib
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Email templates are compiled once at import
+_templates = Environment(
+    loader=FileSystemLoader(Path(__file__).resolve().parent.parent / "templates" / "email"),
+    autoescape=select_autoescape(["html"]),
+    keep_trailing_newline=True
+)
+_RESET_HTML = _templates.get_template("password_reset.html")
+_RESET_TEXT = _templates.get_template("password_reset.txt")
+
 
-def send_email(
+def build_message(
     email_to: str,
     subject: str,
     html_content: str,
     text_content: str = None
-) -> None:
+) -> EmailMessage:
     """
-    Send an email.
+    Build a multipart text/HTML message, or an HTML-only one if no text_content is given.
     """
-    assert settings.EMAILS_FROM_EMAIL, "EMAILS_FROM_EMAIL not set"
-    
-    if not text_content:
-        text_content = html_content.replace('<br>', '\n').replace('</p>', '\n').replace('<p>', '')
-    
-    message = MIMEMultipart("alternative")
+    message = EmailMessage()
     message["Subject"] = subject
     message["From"] = f"{settings.EMAILS_FROM_NAME} <{settings.EMAILS_FROM_EMAIL}>"
     message["To"] = email_to
     
+    if not text_content:
+        message.set_content(html_content, subtype="html")
+        return message
+    
     # Add text and HTML body
-    message.attach(MIMEText(text_content, "plain"))
-    message.attach(MIMEText(html_content, "html"))
+    message.set_content(text_content)
+    message.add_alternative(html_content, subtype="html")
+    return message
+
+
+class SMTPConnection:
+    """
+    One SMTP session (connect, STARTTLS, login) shared by every message sent through it.
     
-    try:
-        if settings.SMTP_HOST and settings.SMTP_PORT:
-            context = ssl.create_default_context()
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                if settings.SMTP_TLS:
-                    server.starttls(context=context)
-                if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                    server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.sendmail(
-                    settings.EMAILS_FROM_EMAIL, 
-                    email_to, 
-                    message.as_string()
-                )
-            logger.info(f"Email sent to {email_to}")
+    The session is reopened after SMTP_MAX_MSGS_PER_CONN messages or SMTP_MAX_CONN_AGE_S
+    seconds, and once if the server drops it mid-send.
+    """
+    
+    # Loading the CA bundle is costly, so every session shares one context
+    _ssl_context = ssl.create_default_context()
+    
+    async def __aenter__(self) -> "SMTPConnection":
+        await self._connect()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self._close()
+    
+    async def _connect(self) -> None:
+        self.server = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            start_tls=False,
+            timeout=settings.SMTP_TIMEOUT_S
+        )
+        await self.server.connect()
+        try:
+            if settings.SMTP_TLS:
+                await self.server.starttls(tls_context=self._ssl_context)
+            # Greet once per session so sends don't each check whether EHLO is needed
+            await self.server.ehlo()
+            if settings.SMTP_USER and settings.SMTP_PASSWORD:
+                await self.server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            self.server.close()
+            raise
+        self._sent = 0
+        self._opened = time.monotonic()
+    
+    async def _close(self) -> None:
+        try:
+            await self.server.quit()
+        except aiosmtplib.SMTPException:
+            self.server.close()
+    
+    async def _reconnect(self) -> None:
+        await self._close()
+        await self._connect()
+    
+    def close(self) -> None:
+        """
+        Drop the session without a QUIT, for connections that are already broken.
+        """
+        self.server.close()
+    
+    async def _rotate_if_stale(self) -> None:
+        if (
+            self._sent >= settings.SMTP_MAX_MSGS_PER_CONN
+            or time.monotonic() - self._opened > settings.SMTP_MAX_CONN_AGE_S
+        ):
+            await self._reconnect()
+    
+    async def send(self, message: EmailMessage, email_to: str) -> None:
+        await self._rotate_if_stale()
+        try:
+            await self.server.send_message(message, sender=settings.EMAILS_FROM_EMAIL, recipients=[email_to])
+        except aiosmtplib.SMTPServerDisconnected:
+            await self._reconnect()
+            await self.server.send_message(message, sender=settings.EMAILS_FROM_EMAIL, recipients=[email_to])
+        self._sent += 1
+    
+    async def send_payload(self, payload: bytes, email_to: str) -> None:
+        """
+        Send an already serialized message, so one payload can go to many recipients.
+        """
+        await self._rotate_if_stale()
+        try:
+            await self.server.sendmail(settings.EMAILS_FROM_EMAIL, [email_to], payload)
+        except aiosmtplib.SMTPServerDisconnected:
+            await self._reconnect()
+            await self.server.sendmail(settings.EMAILS_FROM_EMAIL, [email_to], payload)
+        self._sent += 1
+
+
+class SMTPConnectionPool:
+    """
+    A bounded pool of SMTP sessions, so concurrent senders reuse handshakes.
+    """
+    
+    def __init__(self, max_size: int) -> None:
+        self._slots = asyncio.BoundedSemaphore(max_size)
+        self._idle: "asyncio.Queue[SMTPConnection]" = asyncio.Queue()
+    
+    async def acquire(self) -> SMTPConnection:
+        """
+        Take an idle session, opening one if none is free; waits while max_size are in use.
+        """
+        await self._slots.acquire()
+        try:
+            try:
+                return self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                return await SMTPConnection().__aenter__()
+        except BaseException:
+            self._slots.release()
+            raise
+    
+    def release(self, connection: SMTPConnection, discard: bool = False) -> None:
+        """
+        Return a session to the pool, or close it if it can't be reused.
+        """
+        if discard:
+            connection.close()
         else:
-            logger.warning("Email service not configured, skipping email")
+            self._idle.put_nowait(connection)
+        self._slots.release()
+    
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[SMTPConnection]:
+        connection = await self.acquire()
+        try:
+            yield connection
+        except (
+            aiosmtplib.SMTPServerDisconnected,
+            aiosmtplib.SMTPConnectError,
+            aiosmtplib.SMTPTimeoutError,
+            OSError
+        ):
+            self.release(connection, discard=True)
+            raise
+        except BaseException:
+            self.release(connection)
+            raise
+        else:
+            self.release(connection)
+
+
+smtp_pool = SMTPConnectionPool(settings.SMTP_POOL_SIZE)
+
+
+async def send_emails(emails: List[Dict[str, Any]]) -> int:
+    """
+    Send several emails over a single pooled SMTP connection.
+    
+    Each item holds the keyword arguments of send_email. Returns the number sent.
+    """
+    assert settings.EMAILS_FROM_EMAIL, "EMAILS_FROM_EMAIL not set"
+    
+    if not (settings.SMTP_HOST and settings.SMTP_PORT):
+        logger.warning("Email service not configured, skipping email")
+        return 0
+    
+    sent = 0
+    try:
+        async with smtp_pool.connection() as connection:
+            for email in emails:
+                try:
+                    await connection.send(build_message(**email), email["email_to"])
+                    sent += 1
+                    logger.info(f"Email sent to {email['email_to']}")
+                except aiosmtplib.SMTPRecipientsRefused as e:
+                    logger.error(f"Error sending email: {e}")
     except Exception as e:
         logger.error(f"Error sending email: {e}")
+    return sent
 
 
-def send_password_reset_email(*, email_to: str, token: str, username: str) -> None:
-    """
-    Send a password reset email.
+async def send_email(
+    email_to: str,
+    subject: str,
+    html_content: str,
+    text_content: str = None
+) -> None:
     """
-    reset_link = f"{settings.WEBSITE_URL}/auth/reset-password?token={token}"
+    Send an email.
     
-    subject = f"{settings.APP_NAME} - Password Reset"
+    Without text_content the email is HTML-only, about half the size. Spam filters
+    penalise that, so transactional mail should pass a text part.
+    """
+    await send_emails([{
+        "email_to": email_to,
+        "subject": subject,
+        "html_content": html_content,
+        "text_content": text_content
+    }])
+
+
+async def send_bulk(
+    email_tos: List[str],
+    subject: str,
+    html_content: str,
+    text_content: str = None
+) -> int:
+    """
+    Send the same email to many recipients, serializing it only once.
     
-    html_content = f"""
-    <p>Hi {username},</p>
-    <p>You have requested to reset your password for your {settings.APP_NAME} account.</p>
-    <p>Please click the link below to set a new password:</p>
-    <p><a href="{reset_link}">{reset_link}</a></p>
-    <p>This link will expire in {settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS} hours.</p>
-    <p>If you did not request a password reset, please ignore this email.</p>
-    <br>
-    <p>Best regards,</p>
-    <p>The {settings.APP_NAME} Team</p>
+    Recipients don't see each other: the To header is left undisclosed. Returns the number sent.
     """
+    assert settings.EMAILS_FROM_EMAIL, "EMAILS_FROM_EMAIL not set"
     
-    text_content = f"""
-    Hi {username},
+    if not (settings.SMTP_HOST and settings.SMTP_PORT):
+        logger.warning("Email service not configured, skipping email")
+        return 0
     
-    You have requested to reset your password for your {settings.APP_NAME} account.
+    payload = build_message("undisclosed-recipients:;", subject, html_content, text_content).as_bytes()
     
-    Please click the link below to set a new password:
-    {reset_link}
+    sent = 0
+    try:
+        async with smtp_pool.connection() as connection:
+            for email_to in email_tos:
+                try:
+                    await connection.send_payload(payload, email_to)
+                    sent += 1
+                except aiosmtplib.SMTPRecipientsRefused as e:
+                    logger.error(f"Error sending email: {e}")
+    except Exception as e:
+        logger.error(f"Error sending email: {e}")
+    logger.info(f"Bulk email sent to {sent} of {len(email_tos)} recipients")
+    return sent
+
+
+def render_password_reset_email(*, email_to: str, token: str, username: str) -> Dict[str, Any]:
+    """
+    Build the keyword arguments of send_email for a password reset email.
+    """
+    reset_link = f"{settings.WEBSITE_URL}/auth/reset-password?token={token}"
     
-    This link will expire in {settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS} hours.
+    subject = f"{settings.APP_NAME} - Password Reset"
     
-    If you did not request a password reset, please ignore this email.
+    context = {
+        "username": username,
+        "reset_link": reset_link,
+        "app_name": settings.APP_NAME,
+        "hours": settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS
+    }
+    html_content = _RESET_HTML.render(context)
+    text_content = _RESET_TEXT.render(context)
     
-    Best regards,
-    The {settings.APP_NAME} Team
+    return {
+        "email_to": email_to,
+        "subject": subject,
+        "html_content": html_content,
+        "text_content": text_content
+    }
+
+
+# Renderers for emails queued by template name; each returns send_email's keyword arguments
+EMAIL_TEMPLATES: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "password_reset": render_password_reset_email,
+}
+
+
+def render_email(template: str, *, email_to: str, **context: Any) -> Dict[str, Any]:
     """
-    
-    send_email(
-        email_to=email_to,
-        subject=subject,
-        html_content=html_content,
-        text_content=text_content
-    )
+    Render one of EMAIL_TEMPLATES for a recipient.
+    """
+    return EMAIL_TEMPLATES[template](email_to=email_to, **context)
+
+
+async def send_password_reset_email(*, email_to: str, token: str, username: str) -> None:
+    """
+    Send a password reset email.
+    """
+    await send_email(**render_password_reset_email(email_to=email_to, token=token, username=username))
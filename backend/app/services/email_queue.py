@@ -0,0 +1,234 @@
+"""
+Out-of-process delivery of transactional emails.
+
+API workers append jobs to a Redis stream; run `python -m app.services.email_queue`
+to consume it, so slow SMTP servers never hold up a web worker.
+"""
+import asyncio
+import logging
+import socket
+from email.message import EmailMessage
+from typing import Any, Dict, List, Tuple
+
+import aiosmtplib
+import orjson
+from jinja2 import TemplateError
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
+from app.services.cache_service import get_cache
+from app.services.email import build_message, render_email, smtp_pool
+
+logger = logging.getLogger(__name__)
+
+EMAIL_STREAM = "emails"
+EMAIL_GROUP = "email-senders"
+# Jobs that can't be turned into an email are moved here for inspection
+EMAIL_DEAD_LETTER_STREAM = "emails:dead"
+# Cap the stream so acknowledged jobs don't accumulate forever
+EMAIL_STREAM_MAXLEN = 10000
+# A failed job stays pending and is retried once it has been idle this long
+EMAIL_RETRY_DELAY_MS = 60000
+EMAIL_MAX_ATTEMPTS = 3
+# Hash of entry ID -> failed delivery attempts. Jobs left unsent when a batch aborts
+# are not counted, so they don't use up their retries.
+EMAIL_FAILURES_KEY = "emails:failures"
+# Attempts a batch makes before a high failure rate can abort it
+EMAIL_ABORT_MIN_ATTEMPTS = 5
+# Jobs read per batch, shared across the SMTP connection pool
+EMAIL_BATCH_SIZE = 100
+
+
+async def enqueue_template_email(*, email_to: str, template: str, context: Dict[str, Any]) -> None:
+    """
+    Queue an email that the email worker renders from one of EMAIL_TEMPLATES.
+    """
+    cache = await get_cache()
+    await cache.xadd(
+        EMAIL_STREAM,
+        {"email_to": email_to, "template": template, "context": orjson.dumps(context)},
+        maxlen=EMAIL_STREAM_MAXLEN,
+        approximate=True
+    )
+
+
+async def enqueue_password_reset_email(*, email_to: str, token: str, username: str) -> None:
+    """
+    Queue a password reset email for the email worker.
+    """
+    await enqueue_template_email(
+        email_to=email_to,
+        template="password_reset",
+        context={"token": token, "username": username}
+    )
+
+
+async def _deliver_batch(jobs: List[Tuple[str, EmailMessage, str]]) -> Tuple[List[str], List[str]]:
+    """
+    Send a batch of queued emails over one pooled SMTP connection.
+    
+    Returns (IDs of finished jobs, IDs of failed jobs). Finished jobs were sent or refused
+    by the server for good. Failed jobs, and any left unsent, stay pending and are retried later.
+    """
+    if not (settings.SMTP_HOST and settings.SMTP_PORT):
+        logger.warning("Email service not configured, skipping email")
+        return [entry_id for entry_id, _, _ in jobs], []
+
+    done = []
+    failed = []
+    connection = None
+    try:
+        for attempts, (entry_id, message, email_to) in enumerate(jobs, 1):
+            try:
+                if connection is None:
+                    connection = await smtp_pool.acquire()
+                await connection.send(message, email_to)
+                done.append(entry_id)
+                logger.info(f"Email sent to {email_to}")
+            except aiosmtplib.SMTPRecipientsRefused as e:
+                # Retrying won't help, so drop the job
+                done.append(entry_id)
+                logger.error(f"Dropping email {entry_id}, recipient refused: {e}")
+            except aiosmtplib.SMTPTimeoutError as e:
+                # A session that timed out may be mid-reply, so never reuse it
+                failed.append(entry_id)
+                logger.error(f"Timed out sending email {entry_id}, will retry: {e}")
+                if connection is not None:
+                    smtp_pool.release(connection, discard=True)
+                connection = None
+            except (aiosmtplib.SMTPException, OSError) as e:
+                failed.append(entry_id)
+                logger.error(f"Error sending email {entry_id}, will retry: {e}")
+                # The connection already reconnected once; take a fresh one for the next job
+                if isinstance(e, (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError)):
+                    if connection is not None:
+                        smtp_pool.release(connection, discard=True)
+                    connection = None
+
+            # The server is likely unhealthy; leave the rest for a later retry
+            if attempts >= EMAIL_ABORT_MIN_ATTEMPTS and len(failed) * 3 > attempts:
+                logger.error(f"Aborting email batch after {len(failed)} failures in {attempts} attempts")
+                break
+    finally:
+        if connection is not None:
+            smtp_pool.release(connection)
+
+    return done, failed
+
+
+async def _claim_retries(cache, consumer: str) -> List[Tuple[str, Dict[str, str]]]:
+    """
+    Claim jobs whose delivery failed (or whose consumer died) so they are tried again.
+    """
+    response = await cache.xautoclaim(
+        EMAIL_STREAM, EMAIL_GROUP, consumer, min_idle_time=EMAIL_RETRY_DELAY_MS, count=EMAIL_BATCH_SIZE
+    )
+    # Entries deleted from the stream come back with no fields (Redis 6), so just drop them
+    claimed = [(entry_id, fields) for entry_id, fields in response[1] if fields]
+    deleted = [entry_id for entry_id, fields in response[1] if not fields]
+    if deleted:
+        await _finish(cache, deleted)
+    if not claimed:
+        return []
+
+    failures = await cache.hmget(EMAIL_FAILURES_KEY, [entry_id for entry_id, _ in claimed])
+    jobs = []
+    given_up = []
+    for (entry_id, fields), failed in zip(claimed, failures):
+        if failed and int(failed) >= EMAIL_MAX_ATTEMPTS:
+            logger.error(f"Giving up on email {entry_id} after {failed} failed attempts")
+            given_up.append(entry_id)
+            continue
+        jobs.append((entry_id, fields))
+    if given_up:
+        await _finish(cache, given_up)
+    return jobs
+
+
+async def _dead_letter(cache, entry_id: str, fields: Dict[str, str], error: Exception) -> None:
+    """
+    Move a job that can't be rendered to the dead letter stream and acknowledge it.
+    """
+    logger.error(f"Dead-lettering malformed email {entry_id}: {error!r}")
+    await cache.xadd(
+        EMAIL_DEAD_LETTER_STREAM,
+        {**fields, "entry_id": entry_id, "error": repr(error)},
+        maxlen=EMAIL_STREAM_MAXLEN,
+        approximate=True
+    )
+    await _finish(cache, [entry_id])
+
+
+async def _finish(cache, entry_ids: List[str]) -> None:
+    """
+    Acknowledge finished jobs and forget their failure counts.
+    """
+    async with cache.pipeline(transaction=False) as pipe:
+        pipe.xack(EMAIL_STREAM, EMAIL_GROUP, *entry_ids)
+        pipe.hdel(EMAIL_FAILURES_KEY, *entry_ids)
+        await pipe.execute()
+
+
+def _as_email(fields: Dict[str, str]) -> Dict[str, str]:
+    # Jobs are rendered here, off the API's request path; anything else is malformed
+    if "template" not in fields:
+        raise ValueError("Email job has no template")
+    return render_email(fields["template"], email_to=fields["email_to"], **orjson.loads(fields["context"]))
+
+
+async def run_email_worker(consumer: str) -> None:
+    """
+    Consume queued emails forever in batches, retrying failed jobs with a delay.
+    """
+    cache = await get_cache()
+
+    try:
+        await cache.xgroup_create(EMAIL_STREAM, EMAIL_GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+    while True:
+        jobs = await _claim_retries(cache, consumer)
+
+        # Top the batch up with new jobs, only waiting for them if there is nothing to retry
+        response = await cache.xreadgroup(
+            EMAIL_GROUP,
+            consumer,
+            {EMAIL_STREAM: ">"},
+            count=max(EMAIL_BATCH_SIZE - len(jobs), 1),
+            block=None if jobs else 5000
+        )
+        jobs.extend(response[0][1] if response else [])
+        if not jobs:
+            continue
+
+        batch = []
+        for entry_id, fields in jobs:
+            try:
+                email = _as_email(fields)
+                batch.append((entry_id, build_message(**email), email["email_to"]))
+            except (KeyError, TypeError, ValueError, TemplateError) as e:
+                # A malformed job would fail the same way on every retry
+                await _dead_letter(cache, entry_id, fields, e)
+
+        # Send the batch concurrently, one slice per pooled connection
+        slices = [batch[i::settings.SMTP_POOL_SIZE] for i in range(settings.SMTP_POOL_SIZE)]
+        results = await asyncio.gather(*(_deliver_batch(jobs_slice) for jobs_slice in slices if jobs_slice))
+        done = [entry_id for sent, _ in results for entry_id in sent]
+        failed = [entry_id for _, errored in results for entry_id in errored]
+        if done:
+            await _finish(cache, done)
+        if failed:
+            async with cache.pipeline(transaction=False) as pipe:
+                for entry_id in failed:
+                    pipe.hincrby(EMAIL_FAILURES_KEY, entry_id, 1)
+                await pipe.execute()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(run_email_worker(consumer=socket.gethostname()))
@@ -0,0 +1,2 @@
+class ServiceError(Exception):
+    """Raised when a backing service (database, cache, vector store, LLM API) fails."""
@@ -1,11 +1,12 @@
 import os
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import json
 import httpx
 from loguru import logger
 from app.config import settings
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from app.services.vector_store import query_vector_store
+from app.services.exceptions import ServiceError
 
 class LLMService:
     """Service for interacting with the Language Model API."""
@@ -37,25 +38,11 @@ class LLMService:
             response.raise_for_status()
             return response.json()
     
-    async def get_chat_completion(self, 
-                                 messages: List[Dict[str, str]], 
-                                 query: str,
-                                 server: Optional[str] = None,
-                                 temperature: float = 0.7,
-                                 max_tokens: int = 2000) -> Tuple[str, List[Dict[str, Any]]]:
-        """
-        Get a completion from the chat model with enhanced context from the vector store.
-        
-        Args:
-            messages: The conversation history
-            query: The current user query
-            server: Optional game server to filter results by
-            temperature: Randomness of the output (0-1)
-            max_tokens: Maximum tokens to generate
-            
-        Returns:
-            Tuple of (response text, relevant context documents)
-        """
+    def _build_messages(self,
+                        messages: List[Dict[str, str]],
+                        query: str,
+                        server: Optional[str] = None) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]]]:
+        """Prepend a system message with knowledge base context to the conversation."""
         # Query the vector store for relevant information
         filters = {"server": server} if server else None
         relevant_docs = query_vector_store(query, limit=settings.VECTOR_SEARCH_TOP_K, filters=filters)
@@ -95,20 +82,44 @@ When answering questions:
 Current date: 2025-04-03"""
         }
         
-        # Prepare the full message list
-        full_messages = [system_message] + messages
+        return [system_message] + messages, relevant_docs
+    
+    def _build_payload(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> Dict[str, Any]:
+        """Build a chat completions request payload."""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": 1,
+            "frequency_penalty": 0,
+            "presence_penalty": 0
+        }
+    
+    async def get_chat_completion(self, 
+                                 messages: List[Dict[str, str]], 
+                                 query: str,
+                                 server: Optional[str] = None,
+                                 temperature: float = 0.7,
+                                 max_tokens: int = 2000) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Get a completion from the chat model with enhanced context from the vector store.
+        
+        Args:
+            messages: The conversation history
+            query: The current user query
+            server: Optional game server to filter results by
+            temperature: Randomness of the output (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Returns:
+            Tuple of (response text, relevant context documents)
+        """
+        full_messages, relevant_docs = self._build_messages(messages, query, server)
         
         try:
             # Make the API request
-            payload = {
-                "model": self.model,
-                "messages": full_messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "top_p": 1,
-                "frequency_penalty": 0,
-                "presence_penalty": 0
-            }
+            payload = self._build_payload(full_messages, temperature, max_tokens)
             
             response = await self._make_api_request("chat/completions", payload)
             
@@ -120,3 +131,61 @@ Current date: 2025-04-03"""
         except Exception as e:
             logger.error(f"Error getting chat completion: {e}")
             return "I'm sorry, I encountered an error processing your request. Please try again.", []
+    
+    async def stream_chat_completion(self,
+                                     messages: List[Dict[str, str]],
+                                     query: str,
+                                     server: Optional[str] = None,
+                                     temperature: float = 0.7,
+                                     max_tokens: int = 2000) -> Tuple[AsyncIterator[str], List[Dict[str, Any]]]:
+        """
+        Stream a completion from the chat model with enhanced context from the vector store.
+        
+        Args:
+            messages: The conversation history
+            query: The current user query
+            server: Optional game server to filter results by
+            temperature: Randomness of the output (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Returns:
+            Tuple of (async iterator of response text fragments, relevant context documents)
+            
+        Raises:
+            ServiceError: If the API request fails while streaming
+        """
+        full_messages, relevant_docs = self._build_messages(messages, query, server)
+        payload = self._build_payload(full_messages, temperature, max_tokens)
+        payload["stream"] = True
+        
+        return self._stream_api_request("chat/completions", payload), relevant_docs
+    
+    async def _stream_api_request(self, endpoint: str, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """Make a streaming request to the OpenAI-compatible API and yield content deltas."""
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        
+        url = f"{self.api_base}/{endpoint}"
+        
+        try:
+            async with httpx.AsyncClient(timeout=120.0) as client:
+                async with client.stream("POST", url, headers=headers, json=payload) as response:
+                    response.raise_for_status()
+                    
+                    # Server-sent events: "data: {...}" lines, terminated by "data: [DONE]"
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data: "):
+                            continue
+                        data = line[len("data: "):]
+                        if data == "[DONE]":
+                            break
+                        
+                        choices = json.loads(data).get("choices") or [{}]
+                        content = (choices[0].get("delta") or {}).get("content")
+                        if content:
+                            yield content
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            logger.error(f"Error streaming chat completion: {e}")
+            raise ServiceError(f"Error streaming chat completion: {e}") from e
@@ -57,5 +57,5 @@ if [ "$DEBUG" = "true" ]; then
   exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
 else
   echo "Running in production mode"
-  exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+  exec gunicorn app.main:app -k uvicorn.workers.UvicornWorker -w "${WEB_CONCURRENCY:-$(nproc)}" -b 0.0.0.0:8000
 fi
@@ -82,6 +82,10 @@ def run_migrations_online() -> None:
         )
 
         with context.begin_transaction():
+            # All revisions share this transaction: skip the WAL flush wait and
+            # let index builds and table rewrites sort in memory
+            connection.exec_driver_sql("SET LOCAL synchronous_commit = off")
+            connection.exec_driver_sql("SET LOCAL maintenance_work_mem = '512MB'")
             context.run_migrations()
 
 
@@ -0,0 +1,43 @@
+"""Case-insensitive emails and usernames with a covering login index
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import CITEXT
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    
+    # Compare emails and usernames case-insensitively without functional indexes
+    op.alter_column('users', 'email', type_=CITEXT(), existing_type=sa.String(), existing_nullable=False)
+    op.alter_column('users', 'username', type_=CITEXT(), existing_type=sa.String(), existing_nullable=False)
+    
+    # Let login read id, password hash and active flag straight from the email index
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.create_index(
+        op.f('ix_users_email'),
+        'users',
+        ['email'],
+        unique=True,
+        postgresql_include=['id', 'hashed_password', 'is_active']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    
+    op.alter_column('users', 'username', type_=sa.String(), existing_type=CITEXT(), existing_nullable=False)
+    op.alter_column('users', 'email', type_=sa.String(), existing_type=CITEXT(), existing_nullable=False)
@@ -0,0 +1,40 @@
+"""Composite per-user list indexes; drop the redundant users.id index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The primary key already indexes users.id
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    
+    # Serve "newest first for this user" lists straight from the index
+    op.create_index(
+        'ix_saved_items_user_created',
+        'saved_items',
+        ['user_id', sa.text('created_at DESC')]
+    )
+    op.create_index(
+        'ix_builds_user_updated',
+        'builds',
+        ['user_id', sa.text('updated_at DESC')],
+        postgresql_include=['name', 'is_public']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_builds_user_updated', table_name='builds')
+    op.drop_index('ix_saved_items_user_created', table_name='saved_items')
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
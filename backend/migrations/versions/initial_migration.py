@@ -33,11 +33,12 @@ def upgrade() -> None:
         sa.Column('created_at', sa.DateTime(), nullable=True, default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=True, default=sa.func.now(), onupdate=sa.func.now()),
         sa.PrimaryKeyConstraint('id'),
+        # Indexes are declared with the table so they're built together with it
+        sa.Index(op.f('ix_users_email'), 'email', unique=True),
+        sa.Index(op.f('ix_users_id'), 'id', unique=False),
+        sa.Index(op.f('ix_users_username'), 'username', unique=True),
+        sa.Index(op.f('ix_users_display_name'), 'display_name', unique=False)
     )
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
-    op.create_index(op.f('ix_users_display_name'), 'users', ['display_name'], unique=False)
     
     # Create user_preferences table
     op.create_table(
@@ -79,17 +80,14 @@ def upgrade() -> None:
         sa.Column('created_at', sa.DateTime(), nullable=True, default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=True, default=sa.func.now(), onupdate=sa.func.now()),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index(op.f('ix_builds_name'), 'name', unique=False)
     )
-    op.create_index(op.f('ix_builds_name'), 'builds', ['name'], unique=False)
 
 
 def downgrade() -> None:
+    # Dropping a table drops its indexes
     op.drop_table('builds')
     op.drop_table('saved_items')
     op.drop_table('user_preferences')
-    op.drop_index(op.f('ix_users_username'), table_name='users')
-    op.drop_index(op.f('ix_users_id'), table_name='users')
-    op.drop_index(op.f('ix_users_email'), table_name='users')
-    op.drop_index(op.f('ix_users_display_name'), table_name='users')
     op.drop_table('users')
@@ -0,0 +1,85 @@
+"""Hash-partition saved_items and builds by user_id
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+PARTITIONS = 16
+
+# Indexes rebuilt on the new tables, keyed by table
+INDEXES = {
+    'saved_items': [
+        "CREATE INDEX ix_saved_items_user_created ON saved_items (user_id, created_at DESC)",
+    ],
+    'builds': [
+        "CREATE INDEX ix_builds_name ON builds (name)",
+        "CREATE INDEX ix_builds_user_updated ON builds (user_id, updated_at DESC) INCLUDE (name, is_public)",
+        "CREATE INDEX ix_builds_data_gin ON builds USING gin (data)",
+    ],
+}
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """
+    Recreate a table (partitioned or plain) with the same columns and copy its rows over.
+    
+    The id sequence is detached first so dropping the old table doesn't drop it.
+    """
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    
+    partition_by = " PARTITION BY HASH (user_id)" if partitioned else ""
+    op.execute(f"CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS){partition_by}")
+    if partitioned:
+        for i in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE {table}_p{i} PARTITION OF {table} "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {i})"
+            )
+    
+    # Rows without an owner can't be placed in a partition and were unreachable anyway
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old WHERE user_id IS NOT NULL")
+    op.execute(f"DROP TABLE {table}_old")
+    
+    # Unique constraints on a partitioned table must include the partition key
+    primary_key = "id, user_id" if partitioned else "id"
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN user_id SET NOT NULL")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})")
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    for statement in INDEXES[table]:
+        op.execute(statement)
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def upgrade() -> None:
+    _rebuild('saved_items', partitioned=True)
+    _rebuild('builds', partitioned=True)
+    op.execute(
+        "CREATE TRIGGER builds_set_updated_at BEFORE UPDATE ON builds "
+        "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+    )
+
+
+def downgrade() -> None:
+    _rebuild('builds', partitioned=False)
+    _rebuild('saved_items', partitioned=False)
+    op.execute(
+        "CREATE TRIGGER builds_set_updated_at BEFORE UPDATE ON builds "
+        "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+    )
+    # user_id was nullable before partitioning
+    op.execute("ALTER TABLE builds ALTER COLUMN user_id DROP NOT NULL")
+    op.execute("ALTER TABLE saved_items ALTER COLUMN user_id DROP NOT NULL")
@@ -0,0 +1,64 @@
+"""Fill created_at/updated_at in the database with now() defaults and an update trigger
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+TIMESTAMPS = {
+    'users': ['created_at', 'updated_at'],
+    'user_preferences': ['updated_at'],
+    'saved_items': ['created_at'],
+    'builds': ['created_at', 'updated_at'],
+}
+UPDATED_AT_TABLES = ['users', 'user_preferences', 'builds']
+
+
+def upgrade() -> None:
+    for table, columns in TIMESTAMPS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                server_default=sa.text('now()'),
+                existing_type=sa.DateTime(timezone=True)
+            )
+    
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in UPDATED_AT_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
+    
+    for table, columns in TIMESTAMPS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                server_default=None,
+                existing_type=sa.DateTime(timezone=True)
+            )
@@ -0,0 +1,42 @@
+"""Store additional user preferences as non-null JSONB
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSON, JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE user_preferences SET additional_preferences = '{}' WHERE additional_preferences IS NULL")
+    op.alter_column(
+        'user_preferences',
+        'additional_preferences',
+        type_=JSONB(),
+        existing_type=JSON(),
+        postgresql_using='additional_preferences::jsonb',
+        nullable=False,
+        server_default=sa.text("'{}'::jsonb")
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'user_preferences',
+        'additional_preferences',
+        type_=JSON(),
+        existing_type=JSONB(),
+        postgresql_using='additional_preferences::json',
+        nullable=True,
+        server_default=None
+    )
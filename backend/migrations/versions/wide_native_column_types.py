@@ -0,0 +1,92 @@
+"""BIGINT keys, JSONB build data and TIMESTAMPTZ timestamps with GIN indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSON, JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# Timestamp columns per table; existing naive values were written as UTC
+TIMESTAMPS = {
+    'users': ['created_at', 'updated_at'],
+    'user_preferences': ['updated_at'],
+    'saved_items': ['created_at'],
+    'builds': ['created_at', 'updated_at'],
+}
+
+
+def upgrade() -> None:
+    # Widen foreign keys before the keys they reference
+    for table in ('user_preferences', 'saved_items', 'builds'):
+        op.alter_column(table, 'user_id', type_=sa.BigInteger(), existing_type=sa.Integer())
+    for table in ('users', 'user_preferences', 'saved_items', 'builds'):
+        op.alter_column(table, 'id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+        op.execute(f"ALTER SEQUENCE {table}_id_seq AS bigint")
+    
+    for table, columns in TIMESTAMPS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+    
+    op.alter_column(
+        'builds',
+        'data',
+        type_=JSONB(),
+        existing_type=JSON(),
+        existing_nullable=False,
+        postgresql_using='data::jsonb'
+    )
+    
+    # Allow containment (@>) queries on JSON documents
+    op.create_index('ix_builds_data_gin', 'builds', ['data'], postgresql_using='gin')
+    op.create_index(
+        'ix_user_preferences_additional_gin',
+        'user_preferences',
+        ['additional_preferences'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_preferences_additional_gin', table_name='user_preferences')
+    op.drop_index('ix_builds_data_gin', table_name='builds')
+    
+    op.alter_column(
+        'builds',
+        'data',
+        type_=JSON(),
+        existing_type=JSONB(),
+        existing_nullable=False,
+        postgresql_using='data::json'
+    )
+    
+    for table, columns in TIMESTAMPS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+    
+    for table in ('users', 'user_preferences', 'saved_items', 'builds'):
+        op.execute(f"ALTER SEQUENCE {table}_id_seq AS integer")
+        op.alter_column(table, 'id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
+    for table in ('user_preferences', 'saved_items', 'builds'):
+        op.alter_column(table, 'user_id', type_=sa.Integer(), existing_type=sa.BigInteger())
@@ -39,6 +39,9 @@ class Settings(BaseSettings):
     REQUEST_DELAY: float = 1.0  # seconds between requests
     MAX_RETRIES: int = 3
     
+    # Game client extraction
+    IMAGE_DOWNLOAD_CONCURRENCY: int = int(os.getenv("IMAGE_DOWNLOAD_CONCURRENCY", "16"))
+    
     # Game servers
     GAME_SERVERS: List[str] = os.getenv("GAME_SERVERS", "Alpha-1,Alpha-2").split(",")
     
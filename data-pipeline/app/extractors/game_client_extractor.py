@@ -1,13 +1,18 @@
 import os
-import json
 import logging
 import hashlib
+import shutil
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import AsyncIterator, Dict, Iterator, List, Any, Optional, Tuple, Set
 import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
 import aiohttp
 import aiofiles
+import ijson
+import orjson
 from PIL import Image
 from io import BytesIO
 import re
@@ -16,6 +21,65 @@ from ..config import settings
 from ..schemas import ItemData, ClassData, AbilityData, LocationData
 from ..processors.validator import DataValidator
 
+
+def _dumps(data: Any) -> bytes:
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+
+# Raw item fields copied into an item's metadata
+_ITEM_METADATA_KEYS = ("bindType", "stackLimit", "sellPrice", "weight", "requiredLevel")
+
+# Above this many temp files, cleanup unlinks them from a thread pool
+CLEANUP_PARALLEL_THRESHOLD = 1000
+
+# Read size for streamed image downloads; most item icons fit in one chunk
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+# Part of the processed-data cache key; bump whenever _convert_item_data or _convert_class_data change
+SCHEMA_VERSION = "3"
+
+
+# Map common stat name variations to standard names
+_STAT_MAP = {
+    "str": "strength",
+    "dex": "dexterity",
+    "int": "intelligence",
+    "con": "constitution",
+    "wis": "wisdom",
+    "cha": "charisma",
+    "hp": "health",
+    "mp": "mana",
+    "ap": "attackPower",
+    "sp": "spellPower",
+    # Add more mappings as needed
+}
+# Finds the leftmost (then longest) key contained in a stat name in one pass
+_STAT_KEYS_RE = re.compile('(' + '|'.join(sorted(map(re.escape, _STAT_MAP), key=len, reverse=True)) + ')')
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z]')
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _load_json_array(path: Path) -> List[Any]:
+    """
+    Parse a JSON array file one element at a time, without holding the raw text in memory.
+    """
+    with open(path, 'rb') as f:
+        return list(ijson.items(f, 'item', use_float=True))
+
 logger = logging.getLogger("game_client_extractor")
 
 class GameClientExtractor:
@@ -28,7 +92,6 @@ class GameClientExtractor:
         self.game_path = game_path or settings.GAME_CLIENT_PATH
         self.output_path = Path(settings.DATA_OUTPUT_PATH) / "game_client"
         self.temp_path = Path(settings.TEMP_DIR) / "game_client"
-        self.validator = DataValidator()
         
         # Create directories if they don't exist
         self.output_path.mkdir(parents=True, exist_ok=True)
@@ -41,11 +104,31 @@ class GameClientExtractor:
         self.cache_path = self.temp_path / "cache"
         self.cache_path.mkdir(exist_ok=True)
         
+        # HTTP session shared by every download in an extract_all run
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Worker processes for the CPU-bound convert and validate loops, alive for an extract_all run
+        self._pool_size = os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        
     async def extract_all(self) -> Tuple[int, int, List[str]]:
         """
         Extract all data from the game client.
         Returns (success_count, error_count, error_list)
         """
+        # One connection pool for patch files and images, reused across phases
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=30)
+        ) as self._session:
+            with ProcessPoolExecutor(max_workers=self._pool_size) as self._pool:
+                try:
+                    return await self._extract_all()
+                finally:
+                    self._session = None
+                    self._pool = None
+    
+    async def _extract_all(self) -> Tuple[int, int, List[str]]:
         logger.info("Starting game client data extraction")
         
         if not self.game_path or not os.path.exists(self.game_path):
@@ -61,23 +144,41 @@ class GameClientExtractor:
         error_messages = []
         
         # Run all extraction functions
-        extraction_tasks = [
-            self.extract_items(),
-            self.extract_classes(),
-            self.extract_abilities(),
-            self.extract_locations(),
-            self.extract_resources(),
-            self.extract_npcs(),
-            self.extract_quests()
-        ]
+        extractors = {
+            "items": self.extract_items,
+            "classes": self.extract_classes,
+            "abilities": self.extract_abilities,
+            "locations": self.extract_locations,
+            "resources": self.extract_resources,
+            "npcs": self.extract_npcs,
+            "quests": self.extract_quests
+        }
+        started = time.monotonic()
+        
+        async def run_extractor(name: str, extractor) -> Tuple[str, Any]:
+            try:
+                return name, await extractor()
+            except Exception as e:
+                return name, e
         
-        # Execute all tasks and collect results
+        # Execute all tasks and collect results as each one finishes
         try:
-            results = await asyncio.gather(*extraction_tasks, return_exceptions=True)
+            # On Python 3.12+ each extractor starts eagerly, so the ones that never
+            # block finish inline instead of taking a trip through the event loop
+            eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+            loop = asyncio.get_running_loop()
+            extraction_tasks = [
+                eager_task_factory(loop, run_extractor(name, extractor))
+                if eager_task_factory is not None
+                else asyncio.ensure_future(run_extractor(name, extractor))
+                for name, extractor in extractors.items()
+            ]
             
-            for result in results:
+            for next_done in asyncio.as_completed(extraction_tasks):
+                name, result = await next_done
+                elapsed = time.monotonic() - started
                 if isinstance(result, Exception):
-                    logger.error(f"Extraction error: {str(result)}")
+                    logger.error(f"Extraction error in {name} after {elapsed:.1f}s: {str(result)}")
                     error_count += 1
                     error_messages.append(str(result))
                 elif isinstance(result, tuple) and len(result) == 3:
@@ -85,6 +186,7 @@ class GameClientExtractor:
                     success_count += success
                     error_count += errors
                     error_messages.extend(msgs)
+                    logger.info(f"Finished extracting {name} after {elapsed:.1f}s: {success} successes, {errors} errors")
         except Exception as e:
             logger.exception("Failed to run extraction tasks")
             error_count += 1
@@ -98,6 +200,28 @@ class GameClientExtractor:
             
         return success_count, error_count, error_messages
     
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        Yield the shared session, or a short-lived one when called outside extract_all.
+        """
+        if self._session is not None:
+            yield self._session
+            return
+        async with aiohttp.ClientSession() as session:
+            yield session
+    
+    @contextmanager
+    def _pool_scope(self) -> Iterator[ProcessPoolExecutor]:
+        """
+        Yield the shared process pool, or a short-lived one when called outside extract_all.
+        """
+        if self._pool is not None:
+            yield self._pool
+            return
+        with ProcessPoolExecutor(max_workers=self._pool_size) as pool:
+            yield pool
+    
     async def download_from_patch_server(self) -> bool:
         """
         Download necessary files from the patch server.
@@ -121,7 +245,7 @@ class GameClientExtractor:
             "Data/quests.json"
         ]
         
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             for file_path in essential_files:
                 target_url = f"{patch_server_url}/{file_path}"
                 local_path = self.temp_path / file_path
@@ -178,41 +302,12 @@ class GameClientExtractor:
             return success_count, 1, [error_message]
         
         try:
-            # Read and parse items data
-            async with aiofiles.open(items_file, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                items_data = json.loads(content)
-            
-            # Process each item
-            all_items = []
-            for raw_item in items_data:
-                try:
-                    # Convert to our schema
-                    item = self._convert_item_data(raw_item)
-                    
-                    # Validate
-                    validation_errors = self.validator.validate_item(item)
-                    if validation_errors:
-                        error_count += 1
-                        error_message = f"Item validation failed for {item.get('id', 'unknown')}: {validation_errors}"
-                        error_messages.append(error_message)
-                        logger.warning(error_message)
-                        continue
-                    
-                    # Add to our collection
-                    all_items.append(item)
-                    success_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    error_message = f"Failed to process item {raw_item.get('id', 'unknown')}: {str(e)}"
-                    error_messages.append(error_message)
-                    logger.exception(error_message)
-            
-            # Save processed data
+            # Convert and validate on all cores, unless the source is unchanged since the last run
             output_file = self.output_path / "processed_items.json"
-            async with aiofiles.open(output_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(all_items, indent=2))
+            all_items, item_errors = await self._process_data_file("item", items_file, output_file)
+            success_count += len(all_items)
+            error_count += len(item_errors)
+            error_messages.extend(item_errors)
             
             logger.info(f"Extracted {success_count} items with {error_count} errors")
             
@@ -246,41 +341,12 @@ class GameClientExtractor:
             return success_count, 1, [error_message]
         
         try:
-            # Read and parse classes data
-            async with aiofiles.open(classes_file, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                classes_data = json.loads(content)
-            
-            # Process each class
-            all_classes = []
-            for raw_class in classes_data:
-                try:
-                    # Convert to our schema
-                    class_data = self._convert_class_data(raw_class)
-                    
-                    # Validate
-                    validation_errors = self.validator.validate_class(class_data)
-                    if validation_errors:
-                        error_count += 1
-                        error_message = f"Class validation failed for {class_data.get('id', 'unknown')}: {validation_errors}"
-                        error_messages.append(error_message)
-                        logger.warning(error_message)
-                        continue
-                    
-                    # Add to our collection
-                    all_classes.append(class_data)
-                    success_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    error_message = f"Failed to process class {raw_class.get('id', 'unknown')}: {str(e)}"
-                    error_messages.append(error_message)
-                    logger.exception(error_message)
-            
-            # Save processed data
+            # Convert and validate on all cores, unless the source is unchanged since the last run
             output_file = self.output_path / "processed_classes.json"
-            async with aiofiles.open(output_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(all_classes, indent=2))
+            all_classes, class_errors = await self._process_data_file("class", classes_file, output_file)
+            success_count += len(all_classes)
+            error_count += len(class_errors)
+            error_messages.extend(class_errors)
             
             logger.info(f"Extracted {success_count} classes with {error_count} errors")
                 
@@ -363,6 +429,69 @@ class GameClientExtractor:
         
         return success_count, error_count, error_messages
     
+    async def _process_data_file(self, kind: str, source_file: Path, output_file: Path) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Convert and validate a source data file into output_file.
+        The result is cached by source hash and SCHEMA_VERSION, so unchanged files are not reprocessed.
+        Returns (converted records, error messages).
+        """
+        digest = await asyncio.to_thread(_file_digest, source_file)
+        cache_file = self.cache_path / f"{output_file.stem}-{SCHEMA_VERSION}-{digest}.json"
+        errors_file = cache_file.with_suffix(".errors.json")
+        
+        if cache_file.exists():
+            logger.info(f"{source_file.name} is unchanged, reusing cached {output_file.name}")
+            await asyncio.to_thread(shutil.copyfile, cache_file, output_file)
+            records = await asyncio.to_thread(_load_json_array, cache_file)
+            error_messages = await asyncio.to_thread(_load_json_array, errors_file) if errors_file.exists() else []
+            return records, error_messages
+        
+        raw_records = await asyncio.to_thread(_load_json_array, source_file)
+        records, error_messages = await self._process_in_pool(kind, raw_records)
+        
+        # Save processed data
+        payload = _dumps(records)
+        async with aiofiles.open(output_file, 'wb') as f:
+            await f.write(payload)
+        
+        # The cache file marks a hit, so it is written last and atomically
+        await asyncio.to_thread(_write_atomic, errors_file, _dumps(error_messages))
+        await asyncio.to_thread(_write_atomic, cache_file, payload)
+        
+        return records, error_messages
+    
+    async def _process_in_pool(self, kind: str, raw_records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Convert and validate raw items or classes in contiguous shards across the process pool.
+        Returns (converted records in source order, error messages).
+        """
+        if not raw_records:
+            return [], []
+        
+        shard_size = -(-len(raw_records) // self._pool_size)
+        loop = asyncio.get_running_loop()
+        with self._pool_scope() as pool:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, _process_records, kind, raw_records[i:i + shard_size])
+                for i in range(0, len(raw_records), shard_size)
+            ))
+        
+        # Shards only see their own IDs, so drop later duplicates across shards here
+        records = []
+        error_messages = []
+        seen_ids: Set[str] = set()
+        for shard_records, shard_errors in results:
+            error_messages.extend(shard_errors)
+            for record in shard_records:
+                if record["id"] in seen_ids:
+                    error_messages.append(f"{kind.title()} validation failed for {record['id']}: ['Duplicate {kind} ID: {record['id']}']")
+                    logger.warning("%s validation failed for %s: duplicate ID", kind.title(), record["id"])
+                    continue
+                seen_ids.add(record["id"])
+                records.append(record)
+        
+        return records, error_messages
+    
     async def _download_item_images(self, items: List[Dict[str, Any]]) -> None:
         """
         Download images for items.
@@ -373,28 +502,30 @@ class GameClientExtractor:
         images_dir = self.output_path / "images" / "items"
         images_dir.mkdir(parents=True, exist_ok=True)
         
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
+            # Start a new download as soon as any slot frees up
+            semaphore = asyncio.Semaphore(settings.IMAGE_DOWNLOAD_CONCURRENCY)
+            
+            async def download(url: str, path: Path) -> None:
+                async with semaphore:
+                    await self._download_image(session, url, path)
+            
+            # One directory scan instead of a stat per item
+            existing = await asyncio.to_thread(lambda: {entry.name for entry in os.scandir(images_dir)})
+            
             tasks = []
             for item in items:
                 if "icon_url" in item and item["icon_url"]:
                     file_name = f"{item['id']}.png"
-                    local_path = images_dir / file_name
                     
                     # Skip if already downloaded
-                    if local_path.exists():
+                    if file_name in existing:
                         continue
                     
-                    task = self._download_image(session, item["icon_url"], local_path)
-                    tasks.append(task)
+                    tasks.append(asyncio.create_task(download(item["icon_url"], images_dir / file_name)))
             
-            if tasks:
-                # Download in batches to avoid overwhelming the server
-                batch_size = 10
-                for i in range(0, len(tasks), batch_size):
-                    batch = tasks[i:i+batch_size]
-                    await asyncio.gather(*batch)
-                    # Small delay between batches
-                    await asyncio.sleep(1)
+            for task in asyncio.as_completed(tasks):
+                await task
     
     async def _download_image(self, session: aiohttp.ClientSession, url: str, path: Path) -> None:
         """
@@ -403,23 +534,25 @@ class GameClientExtractor:
         try:
             async with session.get(url) as response:
                 if response.status == 200:
-                    data = await response.read()
-                    
-                    # Resize and optimize the image
+                    # Resize and optimize the image; Pillow needs the whole file
                     if settings.OPTIMIZE_IMAGES:
+                        data = await response.read()
                         try:
-                            img = Image.open(BytesIO(data))
-                            img = self._optimize_image(img)
-                            img.save(path, optimize=True)
+                            # Pillow releases the GIL while decoding and resizing, so keep it off the event loop
+                            await asyncio.to_thread(self._optimize_and_save, data, path)
                         except Exception as e:
                             logger.warning(f"Failed to optimize image {url}: {str(e)}")
                             # Save original if optimization fails
                             async with aiofiles.open(path, 'wb') as f:
                                 await f.write(data)
                     else:
-                        # Save without optimization
-                        async with aiofiles.open(path, 'wb') as f:
-                            await f.write(data)
+                        # Save without optimization, streaming straight to disk. A partial
+                        # file would look downloaded on the next run, so write it aside first
+                        part_path = path.with_name(path.name + ".part")
+                        async with aiofiles.open(part_path, 'wb') as f:
+                            async for chunk in response.content.iter_chunked(IMAGE_CHUNK_SIZE):
+                                await f.write(chunk)
+                        os.replace(part_path, path)
                     
                     logger.debug(f"Downloaded image: {url}")
                 else:
@@ -427,6 +560,14 @@ class GameClientExtractor:
         except Exception as e:
             logger.warning(f"Error downloading image {url}: {str(e)}")
     
+    def _optimize_and_save(self, data: bytes, path: Path) -> None:
+        """
+        Decode, optimize and save an image. Blocking; runs in a worker thread.
+        """
+        img = Image.open(BytesIO(data))
+        img = self._optimize_image(img)
+        img.save(path, optimize=True)
+    
     def _optimize_image(self, img: Image.Image) -> Image.Image:
         """
         Resize and optimize an image.
@@ -475,7 +616,8 @@ class GameClientExtractor:
         
         return None
     
-    def _convert_item_data(self, raw_item: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _convert_item_data(raw_item: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert raw item data to our schema.
         """
@@ -497,29 +639,29 @@ class GameClientExtractor:
             "metadata": {}
         }
         
+        normalize = GameClientExtractor._normalize_stat_name
+        
         # Process stats
-        if "stats" in raw_item and isinstance(raw_item["stats"], dict):
-            for stat_name, value in raw_item["stats"].items():
-                normalized_stat_name = self._normalize_stat_name(stat_name)
-                item["stats"][normalized_stat_name] = value
+        stats = raw_item.get("stats")
+        if isinstance(stats, dict):
+            item["stats"] = {normalize(stat_name): value for stat_name, value in stats.items()}
         
         # Process effects
-        if "effects" in raw_item and isinstance(raw_item["effects"], list):
-            for effect in raw_item["effects"]:
-                if isinstance(effect, dict):
-                    item["effects"].append({
-                        "name": effect.get("name", ""),
-                        "description": effect.get("description", "")
-                    })
+        effects = raw_item.get("effects")
+        if isinstance(effects, list):
+            item["effects"] = [
+                {"name": effect.get("name", ""), "description": effect.get("description", "")}
+                for effect in effects
+                if isinstance(effect, dict)
+            ]
         
         # Extract additional metadata that might be useful
-        for key in ["bindType", "stackLimit", "sellPrice", "weight", "requiredLevel"]:
-            if key in raw_item:
-                item["metadata"][key] = raw_item[key]
+        item["metadata"] = {key: raw_item[key] for key in _ITEM_METADATA_KEYS if key in raw_item}
         
         return item
     
-    def _convert_class_data(self, raw_class: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _convert_class_data(raw_class: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert raw class data to our schema.
         """
@@ -536,54 +678,42 @@ class GameClientExtractor:
         }
         
         # Process abilities
-        if "abilities" in raw_class and isinstance(raw_class["abilities"], list):
-            for ability in raw_class["abilities"]:
-                if isinstance(ability, dict):
-                    class_data["abilities"].append(str(ability.get("id", "")))
+        abilities = raw_class.get("abilities")
+        if isinstance(abilities, list):
+            class_data["abilities"] = [
+                str(ability.get("id", "")) for ability in abilities if isinstance(ability, dict)
+            ]
         
         # Process stat modifiers
-        if "statModifiers" in raw_class and isinstance(raw_class["statModifiers"], dict):
-            for stat_name, value in raw_class["statModifiers"].items():
-                normalized_stat_name = self._normalize_stat_name(stat_name)
-                class_data["stat_modifiers"][normalized_stat_name] = value
+        stat_modifiers = raw_class.get("statModifiers")
+        if isinstance(stat_modifiers, dict):
+            normalize = GameClientExtractor._normalize_stat_name
+            class_data["stat_modifiers"] = {
+                normalize(stat_name): value for stat_name, value in stat_modifiers.items()
+            }
         
         return class_data
     
-    def _normalize_stat_name(self, stat_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _normalize_stat_name(stat_name: str) -> str:
         """
         Normalize stat names to a consistent format.
         """
         # Convert to lowercase and remove spaces
         normalized = stat_name.lower().strip()
         
-        # Map common variations to standard names
-        stat_map = {
-            "str": "strength",
-            "dex": "dexterity",
-            "int": "intelligence",
-            "con": "constitution",
-            "wis": "wisdom",
-            "cha": "charisma",
-            "hp": "health",
-            "mp": "mana",
-            "ap": "attackPower",
-            "sp": "spellPower",
-            # Add more mappings as needed
-        }
-        
         # Check direct matches
-        if normalized in stat_map:
-            return stat_map[normalized]
+        if normalized in _STAT_MAP:
+            return _STAT_MAP[normalized]
         
         # Check if the stat contains any of the keys
-        for key, value in stat_map.items():
-            if key in normalized:
-                return value
+        match = _STAT_KEYS_RE.search(normalized)
+        if match:
+            return _STAT_MAP[match.group(1)]
         
         # Remove special characters and spaces
-        normalized = re.sub(r'[^a-zA-Z]', '', normalized)
-        
-        return normalized
+        return _NON_ALPHA_RE.sub('', normalized)
     
     async def cleanup_temp_files(self) -> None:
         """
@@ -592,11 +722,63 @@ class GameClientExtractor:
         logger.info("Cleaning up temporary files")
         
         try:
-            # Keep cache but remove other temp files
-            for item in self.temp_path.glob("**/*"):
-                if item.is_file() and not str(item).startswith(str(self.cache_path)):
-                    item.unlink()
+            await asyncio.to_thread(self._remove_temp_files)
             
             logger.info("Temporary files cleaned up")
         except Exception as e:
             logger.exception(f"Error cleaning up temporary files: {str(e)}")
+    
+    def _remove_temp_files(self) -> None:
+        """
+        Remove temp files, keeping the cache. Blocking; runs in a worker thread.
+        """
+        cache_dir = str(self.cache_path)
+        paths = []
+        for root, dirs, files in os.walk(self.temp_path):
+            # Keep cache but remove other temp files
+            dirs[:] = [d for d in dirs if os.path.join(root, d) != cache_dir]
+            paths.extend(os.path.join(root, f) for f in files)
+        
+        # Unlinks are independent syscalls, so spread large sets over a few threads
+        if len(paths) > CLEANUP_PARALLEL_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                list(pool.map(os.unlink, paths))
+        else:
+            for path in paths:
+                os.unlink(path)
+
+
+def _process_records(kind: str, raw_records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Convert and validate a shard of raw items or classes. Runs in a worker process.
+    Returns (converted records, error messages).
+    """
+    # A fresh validator per shard, so duplicate IDs aren't carried over between runs
+    validator = DataValidator()
+    if kind == "item":
+        convert, validate = GameClientExtractor._convert_item_data, validator.validate_item
+    else:
+        convert, validate = GameClientExtractor._convert_class_data, validator.validate_class
+    
+    records = []
+    error_messages = []
+    for raw_record in raw_records:
+        try:
+            # Convert to our schema
+            record = convert(raw_record)
+            
+            # Validate
+            validation_errors = validate(record)
+            if validation_errors:
+                error_messages.append(f"{kind.title()} validation failed for {record.get('id', 'unknown')}: {validation_errors}")
+                logger.warning("%s validation failed for %s: %s", kind.title(), record.get('id', 'unknown'), validation_errors)
+                continue
+            
+            records.append(record)
+            
+        except Exception as e:
+            # No traceback per malformed record; the message says what failed
+            error_messages.append(f"Failed to process {kind} {raw_record.get('id', 'unknown')}: {str(e)}")
+            logger.warning("Failed to process %s %s: %s", kind, raw_record.get('id', 'unknown'), e)
+    
+    return records, error_messages
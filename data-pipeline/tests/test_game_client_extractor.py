@@ -0,0 +1,31 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.extractors import game_client_extractor
+from app.extractors.game_client_extractor import GameClientExtractor
+
+
+def test_extract_all_on_empty_game_dir(tmp_path, monkeypatch):
+    """
+    extract_all runs end to end, opening and closing its session and process pool,
+    when the game directory holds no data files.
+    """
+    game_path = tmp_path / "game"
+    game_path.mkdir()
+    monkeypatch.setattr(game_client_extractor, "settings", SimpleNamespace(
+        GAME_CLIENT_PATH=str(game_path),
+        DATA_OUTPUT_PATH=str(tmp_path / "output"),
+        TEMP_DIR=str(tmp_path / "temp"),
+        CLEANUP_TEMP_FILES=True,
+        DOWNLOAD_ITEM_IMAGES=False,
+    ))
+
+    extractor = GameClientExtractor()
+    success_count, error_count, error_messages = asyncio.run(extractor.extract_all())
+
+    assert success_count == 0
+    assert "Items data file not found" in error_messages
+    assert "Classes data file not found" in error_messages
+    assert error_count == len(error_messages)
+    assert extractor._pool is None
+    assert extractor._session is None
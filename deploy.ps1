@@ -185,6 +185,7 @@ Write-ColorOutput "Deploying application..." $colors.Info
 kubectl apply -f "$K8S_DIR/04-deployment.yaml"
 kubectl apply -f "$K8S_DIR/05-service.yaml"
 kubectl apply -f "$K8S_DIR/06-ingress.yaml"
+kubectl apply -f "$K8S_DIR/08-email-worker.yaml"
 
 Write-ColorOutput "✅ Kubernetes manifests applied" $colors.Success
 Write-Host ""